@@ -0,0 +1,204 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from pgops.pgops import Pgops
+from pgops.matchmaking.pgops_orchestrator import Orchestrator
+from pgops.bots.examples.random_player import RandomPlayer
+from pgops.bots.examples.matching_player import MatchingPlayer
+from pgops.bots.examples.matching_plus import MatchingPlus
+from pgops.bots.examples.memory_plus import MemoryPlus
+from pgops.bots.examples.adaptive_gops_v3 import AdaptiveGopsV3
+
+SEED = 20240101
+GAME_TYPES = ["gops", "bgops", "bgops_minus"]
+# fixed pairings per game type; only bots that support the game type
+PAIRINGS = {
+    "gops": [(RandomPlayer, MatchingPlus), (AdaptiveGopsV3, MemoryPlus)],
+    "bgops": [(RandomPlayer, MatchingPlus), (MatchingPlayer, MemoryPlus)],
+    "bgops_minus": [(RandomPlayer, MatchingPlus), (MatchingPlayer, MemoryPlus)],
+}
+ACCESSORS = [
+    "get_state",
+    "get_observation",
+    "get_current_bid_target",
+    "get_all_bid_targets",
+    "get_playable_cards_in_own_hand",
+    "get_playable_cards_in_opponent_hand",
+    "get_all_cards_in_own_playzone",
+    "get_own_score",
+]
+
+def idle_orchestrator(game_type):
+    """An orchestrator with default settings that has played no games, for calling `play_game` directly."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Orchestrator(game_type, [], "round_robin", visualize=False)
+
+def play_games(player_a, player_b, game_type, num_games):
+    """Plays seeded games through `Orchestrator.play_game`, like a tournament does. Returns games per second."""
+    orchestrator = idle_orchestrator(game_type)
+    game = Pgops(game_type, rng=random.Random(SEED))
+    a_rng = random.Random()
+    b_rng = random.Random()
+    start = time.perf_counter()
+    for i in range(num_games):
+        a_rng.seed(SEED + i)
+        b_rng.seed(SEED - i)
+        orchestrator.play_game(player_a, player_b, game, a_rng, b_rng)
+    return num_games / (time.perf_counter() - start)
+
+def mid_game(game_type, turns=5):
+    """A seeded game and two random bots, `turns` turns in, with a fresh bid target drawn."""
+    game = Pgops(game_type, rng=random.Random(SEED))
+    player_a = RandomPlayer(game_type)
+    player_b = RandomPlayer(game_type)
+    player_a.setup(game, "player_a", random.Random(SEED))
+    player_b.setup(game, "player_b", random.Random(-SEED))
+    game.new_game()
+    for i in range(turns):
+        game.next_turn()
+        player_a.select_and_play_card()
+        player_b.select_and_play_card()
+        game.evaluate_played_cards()
+    game.next_turn()
+    return game, player_a
+
+def calls_per_second(function, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        function()
+    return calls / (time.perf_counter() - start)
+
+def bench_masked_game_state(game_type, calls, cached):
+    game, player = mid_game(game_type)
+    if cached:
+        return calls_per_second(game.masked_game_state, calls)
+    def uncached():
+        game.cached_state = None
+        game.masked_game_state()
+    return calls_per_second(uncached, calls)
+
+def bench_evaluate_played_cards(game_type, calls):
+    """Times only `evaluate_played_cards`, over seeded games between random bots."""
+    game = Pgops(game_type, rng=random.Random(SEED))
+    player_a = RandomPlayer(game_type)
+    player_b = RandomPlayer(game_type)
+    elapsed = 0.0
+    evaluated = 0
+    seed = SEED
+    while evaluated < calls:
+        seed += 1
+        player_a.setup(game, "player_a", random.Random(seed))
+        player_b.setup(game, "player_b", random.Random(-seed))
+        game.new_game()
+        while not game.is_game_over() and evaluated < calls:
+            game.next_turn()
+            player_a.select_and_play_card()
+            player_b.select_and_play_card()
+            start = time.perf_counter()
+            game.evaluate_played_cards()
+            elapsed += time.perf_counter() - start
+            evaluated += 1
+    return evaluated / elapsed
+
+def bench_accessor(game_type, accessor, calls):
+    game, player = mid_game(game_type)
+    return calls_per_second(getattr(player, accessor), calls)
+
+def bench_tournament(game_type, games_per_match):
+    """Seeded round robin between the benchmark bots for `game_type`. Returns games per second."""
+    bots = []
+    for pairing in PAIRINGS[game_type]:
+        for bot_class in pairing:
+            if bot_class not in [type(bot) for bot in bots]:
+                bots.append(bot_class(game_type))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator = Orchestrator(game_type, bots, "round_robin", matches_per_pairing=1, games_per_match=games_per_match,
+                                    num_tournaments=1, visualize=False, seed=SEED)
+    elapsed = time.perf_counter() - start
+    games = sum(record['games_played'] for record in orchestrator.records.values()) // 2
+    return games / elapsed
+
+def benchmarks(scale):
+    """Yields (name, unit, function) for every benchmark. `scale` multiplies the work per run."""
+    for game_type in GAME_TYPES:
+        for player_a, player_b in PAIRINGS[game_type]:
+            name = f'games/{game_type}/{player_a.__name__}-vs-{player_b.__name__}'
+            yield name, "games/s", lambda a=player_a, b=player_b, g=game_type: play_games(a(g), b(g), g, 200 * scale)
+    for game_type in GAME_TYPES:
+        yield f'engine/{game_type}/masked_game_state_uncached', "calls/s", lambda g=game_type: bench_masked_game_state(g, 2000 * scale, False)
+        yield f'engine/{game_type}/masked_game_state_cached', "calls/s", lambda g=game_type: bench_masked_game_state(g, 20000 * scale, True)
+        yield f'engine/{game_type}/evaluate_played_cards', "calls/s", lambda g=game_type: bench_evaluate_played_cards(g, 5000 * scale)
+    for accessor in ACCESSORS:
+        yield f'bot/gops/{accessor}', "calls/s", lambda a=accessor: bench_accessor("gops", a, 20000 * scale)
+    for game_type in GAME_TYPES:
+        yield f'tournament/{game_type}/round_robin', "games/s", lambda g=game_type: bench_tournament(g, 100 * scale)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(scale=1, repeat=3, only=None):
+    """Runs every benchmark `repeat` times and keeps the best rate. Higher is better for every result."""
+    results = {}
+    for name, unit, function in benchmarks(scale):
+        if only is not None and only not in name:
+            continue
+        rates = [function() for i in range(repeat)]
+        results[name] = {"value": max(rates), "unit": unit}
+        print(f'{name:<70} {max(rates):>14.1f} {unit}', file=sys.stderr)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+            "scale": scale,
+            "repeat": repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(baseline, current):
+    """Prints current / baseline for every benchmark in both runs; above 1 is faster."""
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        ratio = result["value"] / baseline["results"][name]["value"]
+        print(f'{name:<70} {ratio:>7.2f}x')
+
+def get_args():
+    parser = argparse.ArgumentParser(description='Benchmark pgops engine, bot and tournament throughput')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Write results as JSON to this file instead of stdout')
+    parser.add_argument('-c', '--compare', default=None,
+                        help='JSON results of an earlier run to compare against')
+    parser.add_argument('-s', '--scale', type=int, default=1,
+                        help='Multiplies the work done by every benchmark')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='Runs per benchmark; the best one is kept')
+    parser.add_argument('-k', '--only', default=None,
+                        help='Only run benchmarks whose name contains this string')
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = get_args()
+    report = run(args.scale, args.repeat, args.only)
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    elif args.compare is None:
+        print(json.dumps(report, indent=2))
+    if args.compare is not None:
+        with open(args.compare) as baseline_file:
+            compare(json.load(baseline_file), report)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import numpy as np
+
+CARD_VALUES = np.arange(1, 14)
+CARD_BITS = np.left_shift(1, np.arange(13))
+FULL_HAND = (1 << 13) - 1
+ODD_CARDS = sum(1 << (value - 1) for value in range(1, 14, 2))
+EVEN_CARDS = FULL_HAND & ~ODD_CARDS
+
+class BatchObservation:
+    """What one seat sees in every game of a batch at once.
+    Hands are bitmasks where bit `v - 1` is set if card `v` is still in hand.
+    `pot` is the sum of all active bid targets, including the current `target` and any pushed targets.
+    """
+    def __init__(self, hand, opponent_hand, target, pot, my_score, opponent_score, turn, rng):
+        self.hand = hand
+        self.opponent_hand = opponent_hand
+        self.target = target
+        self.pot = pot
+        self.my_score = my_score
+        self.opponent_score = opponent_score
+        self.turn = turn
+        self.rng = rng
+
+    def cards_in_hand(self, mask=None):
+        """Returns a (games, 13) bool array; column `v - 1` is True if card `v` is in `mask` (own hand by default)."""
+        if mask is None:
+            mask = self.hand
+        return (mask[:, None] & CARD_BITS) != 0
+
+    def has_cards(self, values):
+        return (self.hand & np.left_shift(1, values - 1)) != 0
+
+    def random_cards(self, mask=None):
+        present = self.cards_in_hand(mask)
+        keys = np.where(present, self.rng.random(present.shape), -1.0)
+        return np.where(present.any(axis=1), keys.argmax(axis=1) + 1, 0)
+
+    def lowest_cards(self, mask=None):
+        present = self.cards_in_hand(mask)
+        return np.where(present.any(axis=1), present.argmax(axis=1) + 1, 0)
+
+    def highest_cards(self, mask=None):
+        present = self.cards_in_hand(mask)
+        return np.where(present.any(axis=1), 13 - present[:, ::-1].argmax(axis=1), 0)
+
+    def closest_cards(self, values, mask=None):
+        """Card closest to each of `values`; ties go to the lower card. 0 where `mask` is empty."""
+        present = self.cards_in_hand(mask)
+        distance = np.where(present, np.abs(CARD_VALUES[None, :] - values[:, None]), 99)
+        return np.where(present.any(axis=1), distance.argmin(axis=1) + 1, 0)
+
+class BatchResults:
+    def __init__(self, a_scores, b_scores):
+        self.a_scores = a_scores
+        self.b_scores = b_scores
+        self.games_played = len(a_scores)
+        self.a_games_won = int(np.count_nonzero(a_scores > b_scores))
+        self.b_games_won = int(np.count_nonzero(b_scores > a_scores))
+        self.games_drawn = self.games_played - self.a_games_won - self.b_games_won
+
+def batch_policy_of(player):
+    """Accepts a bot class or instance that defines `batch_policy`, or a policy function."""
+    policy = getattr(player, "batch_policy", player)
+    if not callable(policy):
+        raise Exception(f'{player} does not provide a batch_policy')
+    return policy
+
+def simulate_games(player_a, player_b, num_games, seed=None, batch_size=100000, game_type="gops"):
+    """Plays `num_games` games of gops between two vectorized policies, `batch_size` games at a time.
+    A policy takes a `BatchObservation` and returns an int array with the value of the card to play in each game.
+    Bots opt in by defining a `batch_policy(observation)` staticmethod; only stateless bots can do so.
+    """
+    if game_type != "gops":
+        raise Exception(f'Batch simulation only supports gops, not {game_type}')
+    policy_a = batch_policy_of(player_a)
+    policy_b = batch_policy_of(player_b)
+    rng = np.random.default_rng(seed)
+    a_scores = []
+    b_scores = []
+    games_left = num_games
+    while games_left > 0:
+        n = min(batch_size, games_left)
+        a_batch, b_batch = simulate_batch(policy_a, policy_b, n, rng)
+        a_scores.append(a_batch)
+        b_scores.append(b_batch)
+        games_left -= n
+    return BatchResults(np.concatenate(a_scores), np.concatenate(b_scores))
+
+def simulate_batch(policy_a, policy_b, n, rng):
+    a_hand = np.full(n, FULL_HAND, dtype=np.int64)
+    b_hand = np.full(n, FULL_HAND, dtype=np.int64)
+    a_score = np.zeros(n, dtype=np.int64)
+    b_score = np.zeros(n, dtype=np.int64)
+    pot = np.zeros(n, dtype=np.int64)
+    # one shuffled deck per row
+    deck = np.argsort(rng.random((n, 13)), axis=1) + 1
+    for turn in range(13):
+        target = deck[:, turn]
+        pot = pot + target
+        a_bid = np.asarray(policy_a(BatchObservation(a_hand, b_hand, target, pot, a_score, b_score, turn, rng)), dtype=np.int64)
+        b_bid = np.asarray(policy_b(BatchObservation(b_hand, a_hand, target, pot, b_score, a_score, turn, rng)), dtype=np.int64)
+        a_hand = play_bids(a_hand, a_bid, "player_a")
+        b_hand = play_bids(b_hand, b_bid, "player_b")
+        a_wins = a_bid > b_bid
+        b_wins = b_bid > a_bid
+        a_score = a_score + np.where(a_wins, pot, 0)
+        b_score = b_score + np.where(b_wins, pot, 0)
+        # ties push the pot to the next turn
+        pot = np.where(a_wins | b_wins, 0, pot)
+    return a_score, b_score
+
+def play_bids(hand, bids, player_name):
+    if np.any((bids < 1) | (bids > 13)):
+        raise Exception(f'{player_name} bid a card outside 1-13')
+    bits = np.left_shift(1, bids - 1)
+    if np.any((hand & bits) == 0):
+        raise Exception(f'{player_name} bid a card not in hand')
+    return hand & ~bits
\ No newline at end of file
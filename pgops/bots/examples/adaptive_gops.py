@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class AdaptiveGops(PgopsBot):
@@ -46,7 +44,7 @@ class AdaptiveGops(PgopsBot):
         # if we are definitely losing or winning, initiate "sand attack"
         if self.game_type == "gops" and (my_score > 45 or opp_score > 45):
             self.sand_attack = True
-            return self.play_card(random.choice(hand_cards))
+            return self.play_card(self.rng.choice(hand_cards))
 
         # find opponent's most common play for this target
         current_bid_target = self.get_current_bid_target()
@@ -80,8 +78,9 @@ class AdaptiveGops(PgopsBot):
                 bound_cards.append(hand_cards[i])
             except IndexError:
                 pass
-        bound_cards = set(bound_cards)
-        return random.choice(list(bound_cards))
+        # drop duplicates from wrapping around the hand, keeping hand order for reproducibility
+        bound_cards = list(dict.fromkeys(bound_cards))
+        return self.rng.choice(bound_cards)
     
     def beat_target_by_n(self, value, cards, n):
         """try to pick a card that beats a value by 'n'. Otherwise play the lowest possible card."""
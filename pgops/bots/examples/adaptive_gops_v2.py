@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class AdaptiveGopsV2(PgopsBot):
@@ -44,7 +42,7 @@ class AdaptiveGopsV2(PgopsBot):
         # If we are significantly leading or lagging behind, initiate "sand attack"
         if self.game_type == "gops" and (my_score > 45 or opp_score > 45):
             self.sand_attack = True
-            return self.play_card(random.choice(hand_cards))
+            return self.play_card(self.rng.choice(hand_cards))
 
         # Retrieve the opponent's play history for the current target
         current_bid_target = self.get_current_bid_target()
@@ -74,7 +72,7 @@ class AdaptiveGopsV2(PgopsBot):
         if not bound_cards:
             return self.get_optimal_card(in_card.value, hand_cards)
         else:
-            return random.choice(bound_cards)
+            return self.rng.choice(bound_cards)
     
     def get_optimal_card(self, value, cards, n=None):
         """Finds a card that either beats a given 'value' by 'n' or is the closest to 'value'.
@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class AdaptiveGopsV3(PgopsBot):
@@ -38,16 +36,17 @@ class AdaptiveGopsV3(PgopsBot):
             self.sand_attack = True
             return self.play_card(hand_cards[0])
 
-        my_score = self.get_own_score()
-        opp_score = self.get_opponent_score()
+        observation = self.get_observation()
+        my_score = observation.my_score
+        opp_score = observation.opponent_score
 
         # If we are significantly leading or lagging behind, initiate "sand attack"
         if self.game_type == "gops" and (my_score > 45 or opp_score > 45):
             self.sand_attack = True
-            return self.play_card(random.choice(hand_cards))
+            return self.play_card(self.rng.choice(hand_cards))
         
         current_bid_target = self.get_current_bid_target()
-        opponent_hand = [i['card_value'] for i in self.get_playable_cards_in_opponent_hand()]
+        opponent_hand = observation.hand_card_values(observation.opponent_hand)
 
         # If winning this bid would put us over 45, and we are certain to win, just win the bid
         if self.game_type == "gops" and my_score + current_bid_target.value > 45:
@@ -88,7 +87,7 @@ class AdaptiveGopsV3(PgopsBot):
         if not bound_cards:
             return self.get_optimal_card(in_card.value, hand_cards)
         else:
-            return random.choice(bound_cards)
+            return self.rng.choice(bound_cards)
     
     def get_optimal_card(self, value, cards, n=None):
         """Finds a card that either beats a given 'value' by 'n' or is the closest to 'value'.
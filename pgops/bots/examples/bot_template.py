@@ -23,7 +23,7 @@ class BotTemplate(PgopsBot):
         """
         hand_cards = self.get_playable_cards_in_own_hand()
         if len(hand_cards) > 0:
-            chosen_card = random.choice(hand_cards)
+            chosen_card = self.rng.choice(hand_cards)
             return self.play_card(chosen_card)
 
     def turn_over(self, my_card_played, opponent_card_played, bid_card, result):
@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class MatchPlusCycle(PgopsBot):
@@ -30,7 +28,7 @@ class MatchPlusCycle(PgopsBot):
         # if we are definitely losing or winning, initiate "sand attack"
         if self.game_type == "gops" and (my_score > 45 or opp_score > 45):
             self.sand_attack = True
-            return self.play_card(random.choice(hand_cards))
+            return self.play_card(self.rng.choice(hand_cards))
         
         current_bid_target = self.get_current_bid_target()
         chosen_card = self.beat_by_n(current_bid_target.value, hand_cards)
@@ -45,6 +43,10 @@ class MatchPlusCycle(PgopsBot):
         # underflow
         elif target_value < min(hand_values):
             target_value += 13
+        # a card this bot did not choose was played earlier, e.g. for a move forfeited on the play clock;
+        # take the next card up instead, wrapping around
+        if target_value not in hand_values:
+            target_value = min(hand_values, key=lambda value: (value - target_value) % 13)
         
         return hand_cards[hand_values.index(target_value)]
 
@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class MatchPlusRandom(PgopsBot):
@@ -7,14 +5,18 @@ class MatchPlusRandom(PgopsBot):
     def __init__(self, game_type):
         bot_name = "Match_plus_random"
         supported_game_types = ["gops"]
-        self.pick_random_n()
         super().__init__(game_type, supported_game_types, bot_name=bot_name)
+        # picked on first use so that it comes from the seeded per-game rng
+        self.n = None
+        self.sand_attack = False
     
     def pick_random_n(self, nrange=2):
-        self.n = random.randint(-nrange,nrange)
+        self.n = self.rng.randint(-nrange,nrange)
         self.sand_attack = False
 
     def select_and_play_card(self):
+        if self.n is None:
+            self.pick_random_n()
         hand_cards = self.get_playable_cards_in_own_hand()
 
         # Don't bother with logic if only one card left
@@ -28,7 +30,7 @@ class MatchPlusRandom(PgopsBot):
         # if we are definitely losing or winning, initiate "sand attack"
         if self.game_type == "gops" and (my_score > 45 or opp_score > 45):
             self.sand_attack = True
-            return self.play_card(random.choice(hand_cards))
+            return self.play_card(self.rng.choice(hand_cards))
         
 
         current_bid_target = self.get_current_bid_target()
@@ -44,6 +46,10 @@ class MatchPlusRandom(PgopsBot):
         # underflow
         elif target_value < min(hand_values):
             target_value += 13
+        # a card this bot did not choose was played earlier, e.g. for a move forfeited on the play clock;
+        # take the next card up instead, wrapping around
+        if target_value not in hand_values:
+            target_value = min(hand_values, key=lambda value: (value - target_value) % 13)
         
         return hand_cards[hand_values.index(target_value)]
 
@@ -31,4 +31,10 @@ class MatchingPlayer(PgopsBot):
                 min_value = card.value
                 min_card = card
         if min_card is not None:
-            return self.play_card(min_card)
\ No newline at end of file
+            return self.play_card(min_card)
+
+    @staticmethod
+    def batch_policy(observation):
+        """Vectorized `select_and_play_card` for `pgops.batch_simulator`."""
+        import numpy as np
+        return np.where(observation.has_cards(observation.target), observation.target, observation.lowest_cards())
\ No newline at end of file
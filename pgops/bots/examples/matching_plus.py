@@ -37,4 +37,12 @@ class MatchingPlus(PgopsBot):
                 min_value = card.value
                 min_card = card
         if min_card is not None:
-            return self.play_card(min_card)
\ No newline at end of file
+            return self.play_card(min_card)
+
+    @staticmethod
+    def batch_policy(observation):
+        """Vectorized `select_and_play_card` for `pgops.batch_simulator`."""
+        import numpy as np
+        # one above the target, wrapping 13 around to 1
+        wanted = observation.target % 13 + 1
+        return np.where(observation.has_cards(wanted), wanted, observation.lowest_cards())
\ No newline at end of file
@@ -27,8 +27,9 @@ class MatchingPlusSpy(PgopsBot):
         chosen_card = None
         for card in hand:
             if card.name != "Spy" and card.name != "Bomb":
-                if card.value > card_to_beat.value and card.value-card_to_beat.value < closest_value:
+                if card.value > card_to_beat['card_value'] and card.value-card_to_beat['card_value'] < closest_value:
                     chosen_card = card
+                    closest_value = card.value-card_to_beat['card_value']
         return chosen_card
 
     def select_and_play_card(self):
@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class MemoryPlus(PgopsBot):
@@ -10,22 +8,23 @@ class MemoryPlus(PgopsBot):
         self.setup_memory()
 
     def setup_memory(self):
+        # opponent's plays keyed by target value; negative targets have negative values
         self.memory = {}
         for i in range(1,14):
-            self.memory[f'{i}_positive'] = []
+            self.memory[i] = []
             if self.game_type == "bgops_minus":
-                self.memory[f'-{i}_negative'] = []
+                self.memory[-i] = []
 
     def select_and_play_card(self):
         hand_cards = self.get_playable_cards_in_own_hand()
         if len(hand_cards) < 1:
             return None
         current_bid_target = self.get_current_bid_target()
-        memory_query = f'{current_bid_target.value}_{current_bid_target.suit}'
-        if len(self.memory[memory_query]) < 1:
+        target_memory = self.memory[current_bid_target.value]
+        if len(target_memory) < 1:
             chosen_card = self.random_within_bounds(current_bid_target, hand_cards)
         else:
-            chosen_card = self.beat_most_frequent_by_minimum(current_bid_target, self.memory[memory_query], hand_cards)
+            chosen_card = self.beat_most_frequent_by_minimum(current_bid_target, target_memory, hand_cards)
         if chosen_card is None:
             chosen_card =  self.random_within_bounds(current_bid_target, hand_cards)
         return self.play_card(chosen_card)
@@ -43,7 +42,7 @@ class MemoryPlus(PgopsBot):
 
     def beat_most_frequent_by_minimum(self, input_card, input_memory, hand_cards):
         in_value = input_card.value
-        most_frequent = max(set(input_memory), key = input_memory.count)
+        most_frequent = max(input_memory, key = input_memory.count)
         if input_memory.count(most_frequent)/len(input_memory) < 0.5:
             return self.beat_target_by_minimum(input_card.value, hand_cards)
         if most_frequent.name == "Bomb" or most_frequent.name == "Spy":
@@ -72,15 +71,16 @@ class MemoryPlus(PgopsBot):
             if card.value > lower_bounds and card.value < upper_bounds:
                 playable_cards_in_bounds.append(card)
         if len(playable_cards_in_bounds) > 0:
-            return random.choice(playable_cards_in_bounds)
+            return self.rng.choice(playable_cards_in_bounds)
         else:
-            return random.choice(hand_cards)
+            return self.rng.choice(hand_cards)
 
     def turn_over(self, my_card_played, opponent_card_played, bid_card, result):
         if opponent_card_played is not None and bid_card is not None:
-            self.memory[f'{bid_card.value}_{bid_card.suit}'].append(opponent_card_played)
-            if len(self.memory[f'{bid_card.value}_{bid_card.suit}']) > 50:
-                self.memory[f'{bid_card.value}_{bid_card.suit}'].pop(random.randrange(len(self.memory[f'{bid_card.value}_{bid_card.suit}'])))
+            target_memory = self.memory[bid_card.value]
+            target_memory.append(opponent_card_played)
+            if len(target_memory) > 50:
+                target_memory.pop(self.rng.randrange(len(target_memory)))
         return
     
     def game_over(self, my_score, opponent_score):
@@ -0,0 +1,18 @@
+from ..monte_carlo_bot import MonteCarloBot
+
+class MonteCarloPlayer(MonteCarloBot):
+
+    def __init__(self, game_type):
+        """Example Monte Carlo search bot
+        This bot runs 50 rollouts per move, in which both seats match the newest target half of the time
+        and otherwise play a random card.
+        """
+        bot_name = "MonteCarlo"
+        supported_game_types = ["gops", "bgops", "bgops_minus"]
+        super().__init__(game_type, supported_game_types, bot_name=bot_name, rollout_budget=50)
+
+    def rollout_bid(self, game, seat):
+        hand = game.hands[seat]
+        if game.pot and game.pot[-1] in hand and self.rng.random() < 0.5:
+            return game.pot[-1]
+        return self.rng.choice(hand)
@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class MyLeastCommon(PgopsBot):
@@ -35,7 +33,7 @@ class MyLeastCommon(PgopsBot):
         # if we are definitely losing or winning, initiate "sand attack"
         if self.game_type == "gops" and (my_score > 45 or opp_score > 45):
             self.sand_attack = True
-            return self.play_card(random.choice(hand_cards))
+            return self.play_card(self.rng.choice(hand_cards))
 
         # find my least common plays for this target
         current_bid_target = self.get_current_bid_target()
@@ -44,9 +42,9 @@ class MyLeastCommon(PgopsBot):
         my_lcp = [num for num in my_history if my_history[num] == min_times_played]
         lcp_in_hand = [card for card in hand_cards if card.value in my_lcp]
         if len(lcp_in_hand) > 0:
-            chosen_card = random.choice(lcp_in_hand)
+            chosen_card = self.rng.choice(lcp_in_hand)
         else:
-            chosen_card = random.choice(hand_cards)
+            chosen_card = self.rng.choice(hand_cards)
         return self.play_card(chosen_card)
 
     def turn_over(self, my_card_played, opponent_card_played, bid_card, result):
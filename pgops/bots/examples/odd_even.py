@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class OddEvenBot(PgopsBot):
@@ -30,16 +28,27 @@ class OddEvenBot(PgopsBot):
 
         if self.game_type == "gops" and (my_score > 45 or opponent_score > 45):
             self.sand_attack = True
-            return self.play_card(random.choice(hand_cards))
+            return self.play_card(self.rng.choice(hand_cards))
         
         current_bid_target = self.get_current_bid_target()
         chosen_card = self.closest_odd(current_bid_target.value, hand_cards)
         if chosen_card is None:
             chosen_card = self.closest_even(current_bid_target.value, hand_cards)
         if chosen_card is None:
-            chosen_card = random.choice(hand_cards)
+            chosen_card = self.rng.choice(hand_cards)
         return self.play_card(chosen_card)
 
+    @staticmethod
+    def batch_policy(observation):
+        """Vectorized `select_and_play_card` for `pgops.batch_simulator`."""
+        import numpy as np
+        from ...batch_simulator import ODD_CARDS, EVEN_CARDS
+        closest_odd = observation.closest_cards(observation.target, observation.hand & ODD_CARDS)
+        closest_even = observation.closest_cards(observation.target, observation.hand & EVEN_CARDS)
+        chosen = np.where(closest_odd > 0, closest_odd, closest_even)
+        sand_attack = (observation.my_score > 45) | (observation.opponent_score > 45)
+        return np.where(sand_attack, observation.random_cards(), chosen)
+
     def closest_odd(self, value, cards):
         closest_card = None
         closest_value = float('inf')
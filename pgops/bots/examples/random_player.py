@@ -1,5 +1,3 @@
-import random
-
 from ..pgops_bot import PgopsBot
 
 class RandomPlayer(PgopsBot):
@@ -26,5 +24,10 @@ class RandomPlayer(PgopsBot):
         """
         hand_cards = self.get_playable_cards_in_own_hand()
         if len(hand_cards) > 0:
-            chosen_card = random.choice(hand_cards)
-            return self.play_card(chosen_card)
\ No newline at end of file
+            chosen_card = self.rng.choice(hand_cards)
+            return self.play_card(chosen_card)
+
+    @staticmethod
+    def batch_policy(observation):
+        """Vectorized `select_and_play_card` for `pgops.batch_simulator`."""
+        return observation.random_cards()
\ No newline at end of file
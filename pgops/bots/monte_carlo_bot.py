@@ -0,0 +1,92 @@
+import math
+import time
+
+from .pgops_bot import PgopsBot
+from ..rollout import RolloutGame
+from ..solver import sign
+
+class MonteCarloBot(PgopsBot):
+    """Base class for bots that choose cards by determinized Monte Carlo search.
+
+    Every rollout samples an order for the unseen deck, plays one candidate card against an opponent bid
+    chosen by `rollout_bid` (or the opponent's sealed bid, if own Spy revealed it) and finishes the game
+    in a `RolloutGame`, with `rollout_bid` choosing for both seats. Candidates are picked with UCB1 and
+    the card with the best mean result (1 win, 0 draw, -1 loss) is played.
+
+    Each move stops after `rollout_budget` rollouts or `time_budget` seconds, whichever comes first.
+    Only a rollout budget makes play reproducible for a given seed.
+    Subclasses may override `rollout_bid` with a smarter, but still fast, playout policy.
+    """
+    UCB_EXPLORATION = 1.4
+
+    def __init__(self, game_type, supported_game_types, bot_name="Bot", time_budget=None, rollout_budget=200):
+        super().__init__(game_type, supported_game_types, bot_name=bot_name)
+        if time_budget is None and rollout_budget is None:
+            raise Exception(f'Bot {self.bot_name} needs a time_budget or a rollout_budget')
+        self.time_budget = time_budget
+        self.rollout_budget = rollout_budget
+        self.frozen = False
+
+    def select_and_play_card(self):
+        hand_cards = self.get_playable_cards_in_own_hand()
+        if len(hand_cards) == 0:
+            return None
+        # own card will not be played this turn
+        if self.frozen or len(hand_cards) == 1:
+            return self.play_card(hand_cards[0])
+        values = [card.value for card in hand_cards]
+        best = self.search(self.rollout_root(values), values)
+        return self.play_card(hand_cards[best])
+
+    def turn_over(self, my_card_played, opponent_card_played, bid_card, result):
+        self.frozen = result == "opponent_spy"
+
+    def game_over(self, my_score, opponent_score):
+        self.frozen = False
+
+    def rollout_root(self, values):
+        """The current position from own point of view (seat 0), with the deck in no particular order."""
+        observation = self.get_observation()
+        opponent_values = observation.hand_card_values(observation.opponent_hand)
+        deck_values = observation.deck_card_values(observation.deck)
+        pot = observation.deck_card_values(observation.targets)
+        scores = (observation.my_score, observation.opponent_score)
+        if observation.opponent_sealed_bid is None:
+            return RolloutGame((values, opponent_values), deck_values, pot, scores)
+        locked_bid = observation.hand_values[observation.opponent_sealed_bid]
+        opponent_values.remove(locked_bid)
+        return RolloutGame((values, opponent_values), deck_values, pot, scores, frozen=1, locked_bid=locked_bid)
+
+    def search(self, root, values):
+        """Returns the index in `values` of the card with the best mean rollout result."""
+        totals = [0.0] * len(values)
+        visits = [0] * len(values)
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        rollouts = 0
+        while self.rollout_budget is None or rollouts < self.rollout_budget:
+            # every candidate gets at least one rollout, even on an exhausted clock
+            if deadline is not None and rollouts >= len(values) and time.perf_counter() >= deadline:
+                break
+            if rollouts < len(values):
+                choice = rollouts
+            else:
+                log_rollouts = math.log(rollouts)
+                choice = max(range(len(values)), key=lambda i: totals[i] / visits[i] + self.UCB_EXPLORATION * math.sqrt(log_rollouts / visits[i]))
+            totals[choice] += self.rollout(root, values[choice])
+            visits[choice] += 1
+            rollouts += 1
+        return max(range(len(values)), key=lambda i: totals[i] / visits[i] if visits[i] else -math.inf)
+
+    def rollout(self, root, value):
+        """Plays `value` in a copy of `root` with a freshly shuffled deck. Returns 1, 0 or -1 for own result."""
+        game = RolloutGame(root.hands, root.deck, root.pot, root.scores, root.frozen, root.locked_bid)
+        self.rng.shuffle(game.deck)
+        opponent_bid = self.rollout_bid(game, 1) if game.can_bid(1) else None
+        game.resolve(value, opponent_bid)
+        return sign(game.play_out(self.rollout_bid))
+
+    def rollout_bid(self, game, seat):
+        """Card value `seat` bids during rollouts. Plays uniformly at random by default."""
+        return self.rng.choice(game.hands[seat])
\ No newline at end of file
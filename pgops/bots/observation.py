@@ -0,0 +1,102 @@
+from collections import namedtuple
+
+from ..card_state import CardState
+
+OBSERVATION_FIELDS = [
+    "game_type",
+    "hand",
+    "opponent_hand",
+    "opponent_sealed_bid",
+    "playzone",
+    "opponent_playzone",
+    "deck",
+    "target",
+    "targets",
+    "pot",
+    "my_score",
+    "opponent_score",
+    "frozen",
+    "hand_values",
+    "deck_values",
+]
+
+class Observation(namedtuple("Observation", OBSERVATION_FIELDS)):
+    """Immutable snapshot of everything a bot may know at one decision, built by `PgopsBot.get_observation`.
+
+    Cards are bits in integer masks: bit n of a hand mask is the hand card with `card_id` n, and bit n of
+    a deck mask is the deck card with `card_id` n. Hand bit n is card value n + 1 (Spy and Bomb follow the
+    13 value cards in bgops); `hand_values` and `deck_values` map ids to values for either pile.
+        hand, opponent_hand: playable cards; the opponent's sealed bid counts as in hand
+        opponent_sealed_bid: id of the opponent's sealed bid if own Spy revealed it, else None
+        playzone, opponent_playzone: played cards visible to both players
+        deck: cards not drawn yet
+        target, targets: id of the current bid target (or None) and mask of all active targets
+        pot: total value of all active targets
+        frozen: True if opponent's Spy means own card will not be played this turn
+    """
+    __slots__ = ()
+
+    def has_card(self, card_id):
+        return self.hand >> card_id & 1 == 1
+
+    def opponent_has_card(self, card_id):
+        return self.opponent_hand >> card_id & 1 == 1
+
+    def target_value(self):
+        return self.deck_values[self.target] if self.target is not None else None
+
+    def hand_card_ids(self, mask=None):
+        """Ids of the cards in `mask`, own hand by default, lowest first."""
+        return card_ids(self.hand if mask is None else mask)
+
+    def hand_card_values(self, mask=None):
+        return [self.hand_values[card_id] for card_id in card_ids(self.hand if mask is None else mask)]
+
+    def deck_card_values(self, mask):
+        return [self.deck_values[card_id] for card_id in card_ids(mask)]
+
+def card_ids(mask):
+    ids = []
+    while mask:
+        low_bit = mask & -mask
+        ids.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return ids
+
+def pile_values(pile):
+    """Card values of a pile by `card_id`, shared by every observation of the same pile."""
+    return tuple(card.value for card in pile.cards)
+
+def build_observation(game, player_name, opponent_name, hand_values, deck_values):
+    player = game.players[player_name]
+    opponent = game.players[opponent_name]
+    hand = player.hand
+    opponent_hand = opponent.hand
+    deck = game.deck
+    opponent_sealed_mask = opponent_hand.state_masks[opponent_hand.sealed_bid_state.value]
+    opponent_sealed_bid = None
+    if opponent.frozen and opponent_sealed_mask:
+        opponent_sealed_bid = (opponent_sealed_mask & -opponent_sealed_mask).bit_length() - 1
+    current_mask = deck.state_masks[CardState.current_bid_target.value]
+    score = game.score_players()
+    if player_name == "player_a":
+        my_score, opponent_score = score
+    else:
+        opponent_score, my_score = score
+    return Observation(
+        game.game_type,
+        hand.state_masks[hand.hand_state.value],
+        opponent_hand.state_masks[opponent_hand.hand_state.value] | opponent_sealed_mask,
+        opponent_sealed_bid,
+        hand.state_masks[hand.playzone_state.value],
+        opponent_hand.state_masks[opponent_hand.playzone_state.value],
+        deck.state_masks[CardState.in_deck.value],
+        (current_mask & -current_mask).bit_length() - 1 if current_mask else None,
+        current_mask | deck.state_masks[CardState.previous_bid_targets.value],
+        game.pot_value(),
+        my_score,
+        opponent_score,
+        player.frozen,
+        hand_values,
+        deck_values
+    )
\ No newline at end of file
@@ -1,22 +1,43 @@
+import random
+
 from ..card import Card
 from ..card_state import CardState
+from ..solver import GopsSolver, mask_of_values
+from .observation import build_observation, pile_values
 
 class PgopsBot:
+    # shared by every bot in the process so solved positions are reused across games
+    ENDGAME_SOLVER = GopsSolver()
+
     def __init__(self, game_type, supported_game_types, bot_name="Bot"):
         self.game_type = game_type
         self.bot_name = bot_name
+        # replaced by the orchestrator's per-game stream in `setup`
+        self.rng = random.Random()
+        self.clear_observation()
         if self.game_type not in supported_game_types:
             raise Exception(f'Bot {self.bot_name} does not support game of type {self.game_type}')
 
-    def setup(self, game, player_name):
-        """MUST NOT be overridden"""
+    def setup(self, game, player_name, rng=None):
+        """MUST NOT be overridden
+        `rng` is a seeded `random.Random` for this game; bots should draw all randomness from `self.rng`.
+        """
         self.game = game
+        if rng is not None:
+            self.rng = rng
+        self.clear_observation()
         self.player_name = player_name
         if player_name == "player_a":
             self.opponent_name = "player_b"
         elif player_name == "player_b":
             self.opponent_name = "player_a"
 
+    def clear_observation(self):
+        self.observation = None
+        self.observation_version = None
+        self.hand_values = None
+        self.deck_values = None
+
     def play_card(self, card):
         """MUST NOT be overridden"""
         if self.game.players[self.player_name].frozen:
@@ -28,6 +49,8 @@ class PgopsBot:
     def turn_over(self, my_card_played, opponent_card_played, bid_card, result):
         """Provides information about the previous turn.
         `my_card_played` or `opponent_card_played` might be None.
+        `my_card_played` is the card that was actually played: under the "forfeit_move" clock policy a slow move
+        is replaced with a random card, so it may differ from the card chosen in `select_and_play_card`.
         `bid_card` is the card that players were bidding on that turn.
         `result` is a list containing one or more of the following strings:
         ["win", "lose", "tie", "bomb", "my_spy", "opponent_spy", "both_spy"]
@@ -45,34 +68,39 @@ class PgopsBot:
     def get_state(self):
         """Returns the full, masked game state on demand.
         Masked means a player's current sealed bid appears to still be in hand, unless that player was spied on last turn.
+        The state is cached until the next card changes state; treat it as read-only.
         """
         return self.game.masked_game_state()
 
+    def get_observation(self):
+        """Returns an immutable `Observation` of the game from own point of view, with cards as bitmasks.
+        It is built at most once per game state and shared by every call until a card changes state.
+        See `bots/observation.py` for the fields.
+        """
+        version = self.game.state_version()
+        if self.observation is None or self.observation_version != version:
+            if self.hand_values is None:
+                self.hand_values = pile_values(self.game.players[self.player_name].hand)
+                self.deck_values = pile_values(self.game.deck)
+            self.observation = build_observation(self.game, self.player_name, self.opponent_name, self.hand_values, self.deck_values)
+            self.observation_version = version
+        return self.observation
+
+    def get_own_hand_card(self, card_id):
+        """Returns the Card object in own hand with `card_id`, e.g. to play a card chosen from an observation."""
+        return self.game.players[self.player_name].hand.cards[card_id]
+
     def get_current_bid_target(self):
         """Returns the current bid target:"""
-        state = self.get_state()
-        for card_dict in state['deck_state']:
-            if card_dict['card_reference'].state == CardState.current_bid_target:
-                return card_dict['card_reference']
-        return None
+        return self.game.deck.current_bid_target()
     
     def get_all_bid_targets(self):
         """Returns a list of all active bid targets, including pushed targets."""
-        all_targets = []
-        state = self.get_state()
-        for card_dict in state['deck_state']:
-            if card_dict['card_reference'].state == CardState.current_bid_target or card_dict['card_reference'].state == CardState.previous_bid_targets:
-                all_targets.append(card_dict['card_reference'])
-        return all_targets
+        return self.game.deck.all_bid_targets()
 
     def get_playable_cards_in_own_hand(self):
         """Returns a list of all playable card objects in own hand."""
-        playable_hand = []
-        state = self.get_state()
-        for card_dict in state[f'{self.player_name}_cards']:
-            if card_dict['card_reference'].state in [CardState.player_a_hand, CardState.player_b_hand]:
-                playable_hand.append(card_dict['card_reference'])
-        return playable_hand
+        return self.game.players[self.player_name].hand.playable_cards()
     
     def get_playable_cards_in_opponent_hand(self):
         """Returns a list of dicts of information about all playable cards in opponent's hand.
@@ -83,25 +111,18 @@ class PgopsBot:
         }]
         """
         opponent_hand = []
-        state = self.get_state()
-        for card_dict in state[f'{self.opponent_name}_cards']:
-            if card_dict['card_reference'].state in [CardState.player_a_hand, CardState.player_b_hand, CardState.player_a_sealed_bid, CardState.player_b_sealed_bid]:
-                opponent_hand.append({
-                    "card_value": card_dict['card_reference'].value,
-                    "card_name": card_dict['card_reference'].name
-                })
+        for card in self.game.players[self.opponent_name].hand.cards_in_hand_or_sealed():
+            opponent_hand.append({
+                "card_value": card.value,
+                "card_name": card.name
+            })
         return opponent_hand
     
     def get_all_cards_in_own_playzone(self):
         """Returns a list of cards in own playzone.
         Generally these are any played cards visible to both players.
         """
-        playzone = []
-        state = self.get_state()
-        for card_dict in state[f'{self.player_name}_cards']:
-            if card_dict['card_reference'].state in [CardState.player_a_playzone, CardState.player_b_playzone]:
-                playzone.append(card_dict['card_reference'])
-        return playzone
+        return self.game.players[self.player_name].hand.playzone_cards()
     
     def get_all_cards_in_opponent_playzone(self):
         """Returns a list of dicts of information about all cards in opponent's playzone.
@@ -112,13 +133,11 @@ class PgopsBot:
         }]
         """
         playzone = []
-        state = self.get_state()
-        for card_dict in state[f'{self.opponent_name}_cards']:
-            if card_dict['card_reference'].state in [CardState.player_a_playzone, CardState.player_b_playzone]:
-                playzone.append({
-                    "card_value": card_dict['card_reference'].value,
-                    "card_name": card_dict['card_reference'].name
-                })
+        for card in self.game.players[self.opponent_name].hand.playzone_cards():
+            playzone.append({
+                "card_value": card.value,
+                "card_name": card.name
+            })
         return playzone
     
     def get_opponent_sealed_bid(self):
@@ -131,21 +150,43 @@ class PgopsBot:
         if not self.game.players[self.opponent_name].frozen:
             return None
         else:
-            state = self.get_state()
-            for card_dict in state[f'{self.opponent_name}_cards']:
-                if card_dict['card_reference'].state in [CardState.player_a_sealed_bid, CardState.player_b_sealed_bid]:
-                    return {
-                        "card_value": card_dict['card_reference'].value,
-                        "card_name": card_dict['card_reference'].name
-                    }
-            return None
+            sealed_bid = self.game.players[self.opponent_name].hand.sealed_bid()
+            if sealed_bid is None:
+                return None
+            return {
+                "card_value": sealed_bid.value,
+                "card_name": sealed_bid.name
+            }
     
     def get_own_score(self):
         """Returns own current game score"""
-        state = self.get_state()
-        return state[f'{self.player_name}_score']
+        score = self.game.score_players()
+        return score[0] if self.player_name == "player_a" else score[1]
     
     def get_opponent_score(self):
         """Returns opponent's current game score"""
-        state = self.get_state()
-        return state[f'{self.opponent_name}_score']
\ No newline at end of file
+        score = self.game.score_players()
+        return score[1] if self.player_name == "player_a" else score[0]
+
+    def get_pot_value(self):
+        """Returns the total value of all active bid targets, including pushed targets."""
+        return self.game.pot_value()
+
+    def get_endgame_solution(self, solver=None):
+        """Solves the rest of a gops game exactly, assuming both players play the Nash equilibrium.
+        Returns (value, strategy): value is the expected result (1 win, 0 draw, -1 loss) and
+        strategy maps each playable card in own hand to the probability of playing it.
+        Solving cost grows quickly with the cards left; intended for about 6 cards or fewer.
+        """
+        if self.game_type != "gops":
+            raise Exception(f'Endgame solver only supports gops, not {self.game_type}')
+        if solver is None:
+            solver = self.ENDGAME_SOLVER
+        hand_cards = self.get_playable_cards_in_own_hand()
+        opponent_values = [card['card_value'] for card in self.get_playable_cards_in_opponent_hand()]
+        observation = self.get_observation()
+        deck_values = observation.deck_card_values(observation.deck)
+        pot = self.get_pot_value()
+        diff = self.get_own_score() - self.get_opponent_score()
+        value, strategy = solver.solve(mask_of_values(card.value for card in hand_cards), mask_of_values(opponent_values), mask_of_values(deck_values), pot, diff)
+        return value, {card: strategy[card.value] for card in hand_cards}
\ No newline at end of file
@@ -1,6 +1,9 @@
 from .card_state import CardState
 
 class Card:
+    # value, suit and name never change; the location is `state`, mirrored in the owning pile's bitmasks
+    __slots__ = ("value", "suit", "name", "state", "pile", "card_id")
+
     def __init__(self, value, suit, state, name=None):
         self.value = value
         self.suit = suit
@@ -9,6 +12,15 @@ class Card:
             self.name = str(value)
         else:
             self.name = name
+        self.pile = None
+        self.card_id = None
+
+    def attach(self, pile, card_id):
+        """Registers the pile that tracks this card's state under `card_id`."""
+        self.pile = pile
+        self.card_id = card_id
 
     def change_state(self, new_state):
+        if self.pile is not None:
+            self.pile.track_state_change(self, new_state)
         self.state = new_state
\ No newline at end of file
@@ -21,4 +21,9 @@ class CardState(Enum):
     current_bid_target = 11
     previous_bid_targets = 12
 
-    global_discard = 13
\ No newline at end of file
+    global_discard = 13
+
+# precomputed per player id (1 or 2), so hot paths never construct CardState by value
+HAND_STATES = {1: CardState.player_a_hand, 2: CardState.player_b_hand}
+SEALED_BID_STATES = {1: CardState.player_a_sealed_bid, 2: CardState.player_b_sealed_bid}
+PLAYZONE_STATES = {1: CardState.player_a_playzone, 2: CardState.player_b_playzone}
\ No newline at end of file
@@ -5,17 +5,55 @@ from .card import Card
 from .card_state import CardState
 
 class Deck(Pile):
-    def __init__(self, cards, deck_id):
+    __slots__ = ("rng", "draw_order", "draw_cursor")
+
+    def __init__(self, cards, deck_id, rng=None):
         super().__init__(cards=cards, designation=deck_id)
+        # falls back to the global generator when the game is not seeded
+        self.rng = rng if rng is not None else random
+        self.draw_order = None
+        self.draw_cursor = 0
+
+    def reset(self):
+        super().reset()
+        self.draw_order = None
+        self.draw_cursor = 0
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        """Fixes a random order in which cards are drawn for bidding."""
+        draw_order = list(range(len(self.cards)))
+        self.rng.shuffle(draw_order)
+        self.set_draw_order(draw_order)
+
+    def set_draw_order(self, draw_order):
+        """`draw_order` lists indexes into `self.cards` in the order they will be drawn.
+        It only needs to cover the cards that are drawn during the game.
+        """
+        self.draw_order = list(draw_order)
+        self.draw_cursor = 0
+
+    def draw_card_for_bidding(self):
+        if self.draw_cursor >= len(self.draw_order):
+            raise Exception(f'Draw order exhausted after {self.draw_cursor} cards')
+        card = self.cards[self.draw_order[self.draw_cursor]]
+        self.draw_cursor += 1
+        card.change_state(CardState.current_bid_target)
+        return card
 
     def random_card_for_bidding(self):
-        card = random.choice([card for card in self.cards if card.state == CardState.in_deck])
+        card = self.rng.choice(self.cards_in_state(CardState.in_deck))
         card.change_state(CardState.current_bid_target)
         return card
 
     def count_cards_left_in_deck(self):
-        count = len([card for card in self.cards if card.state == CardState.in_deck])
-        return count
\ No newline at end of file
+        return self.count_cards_in_state(CardState.in_deck)
+
+    def cards_left_in_deck(self):
+        return self.cards_in_state(CardState.in_deck)
+
+    def current_bid_target(self):
+        return self.first_card_in_state(CardState.current_bid_target)
+
+    def all_bid_targets(self):
+        """Current bid target and any pushed targets, in deck order."""
+        return self.cards_in_states(CardState.current_bid_target, CardState.previous_bid_targets)
\ No newline at end of file
@@ -0,0 +1,172 @@
+import argparse
+import bisect
+import mmap
+import struct
+from array import array
+
+from .solver import GopsSolver, canonical_hands, values_of_mask, sign
+
+MAGIC = b"PGOPSEGT"
+HEADER = struct.Struct("<8sIIIIQ")
+# first stored diff, number of stored diffs, index of the first value
+RECORD = struct.Struct("<hHI")
+FORMAT_VERSION = 2
+MAX_TRANSPOSITIONS = 5000000
+FULL_DECK_TOTAL = sum(range(1, 14))
+FIELD_BITS = 13
+
+def hand_patterns(cards):
+    """Every canonical (my_hand, opponent_hand) pair with `cards` cards each and my_hand <= opponent_hand,
+    in a fixed order. Swapping the players negates the value, so the other orientation is not stored.
+    """
+    patterns = set()
+    for my_hand in range(1 << (2 * cards)):
+        if bin(my_hand).count("1") != cards:
+            continue
+        for opponent_hand in range(1 << (2 * cards)):
+            if bin(opponent_hand).count("1") == cards:
+                patterns.add(canonical_hands(my_hand, opponent_hand))
+    return sorted(pattern for pattern in patterns if pattern[0] <= pattern[1])
+
+def table_key(my_canonical, opponent_canonical, deck, pot):
+    return my_canonical | opponent_canonical << FIELD_BITS | deck << 2 * FIELD_BITS | pot << 3 * FIELD_BITS
+
+def canonical_position(my_hand, opponent_hand, deck, pot, diff):
+    """Returns (key, diff, flipped) for a position, with the hands relabeled by rank and the players
+    swapped if needed, as in the solver's transposition keys.
+    """
+    my_canonical, opponent_canonical = canonical_hands(my_hand, opponent_hand)
+    if opponent_canonical < my_canonical:
+        return table_key(opponent_canonical, my_canonical, deck, pot), -diff, True
+    return table_key(my_canonical, opponent_canonical, deck, pot), diff, False
+
+class EndgameTable:
+    """Read-only, memory-mapped table of gops position values written by `generate_table`.
+    Covers positions of a full 13-card game with up to `max_cards` cards in each hand and a pushed pot
+    of at most `max_pot`. Reachable positions are indexed by a sorted array of keys (canonical hands,
+    deck and pot), found by binary search over the mapped file. Each key stores the run of diffs whose
+    value is neither a sure win nor a sure loss; the value only grows with the diff, so diffs below the
+    run are lost and diffs above it are won. Only diffs with the parity of a real game are stored.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.open()
+
+    def open(self):
+        self.file = open(self.path, "rb")
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_cards, self.max_pot, self.size, value_count = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise Exception(f'{self.path} is not a version {FORMAT_VERSION} pgops endgame table')
+        keys_end = HEADER.size + 8 * self.size
+        self.records_offset = keys_end
+        values_offset = keys_end + RECORD.size * self.size
+        self.keys = memoryview(self.mmap)[HEADER.size:keys_end].cast("Q")
+        self.values = memoryview(self.mmap)[values_offset:values_offset + 4 * value_count].cast("f")
+
+    def close(self):
+        self.keys.release()
+        self.values.release()
+        self.mmap.close()
+        self.file.close()
+
+    def __getstate__(self):
+        # the mapping is reopened from the path, e.g. when bots are sent to worker processes
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.path = state["path"]
+        self.open()
+
+    def lookup(self, my_hand, opponent_hand, deck, pot, diff):
+        """Value of the position before the next target is drawn, or None if it is not in the table."""
+        cards = bin(my_hand).count("1")
+        if cards == 0 or cards > self.max_cards or pot > self.max_pot:
+            return None
+        if bin(opponent_hand).count("1") != cards or bin(deck).count("1") != cards:
+            return None
+        deck_total = sum(values_of_mask(deck))
+        remaining = pot + deck_total
+        if diff > remaining or diff < -remaining:
+            return sign(diff)
+        # the scores add up to the targets already won, so the other parity never occurs in a game
+        if (FULL_DECK_TOTAL - remaining - diff) % 2:
+            return None
+        key, diff, flipped = canonical_position(my_hand, opponent_hand, deck, pot, diff)
+        index = bisect.bisect_left(self.keys, key)
+        if index == self.size or self.keys[index] != key:
+            return None
+        first_diff, count, first_value = RECORD.unpack_from(self.mmap, self.records_offset + index * RECORD.size)
+        if diff < first_diff:
+            value = -1
+        elif diff >= first_diff + 2 * count:
+            value = 1
+        else:
+            value = self.values[first_value + (diff - first_diff) // 2]
+        return -value if flipped else value
+
+def solve_diff_run(solver, my_hand, opponent_hand, deck, pot, values):
+    """Appends the values of the undecided diffs of a position to `values`, walking outwards from
+    the diff nearest 0 until the game is won or lost. Returns the first undecided diff.
+    """
+    parity = (FULL_DECK_TOTAL - pot - sum(values_of_mask(deck))) % 2
+    run = []
+    diff = parity
+    value = solver.draw_value(my_hand, opponent_hand, deck, pot, diff)
+    while value < 1:
+        run.append(value)
+        diff += 2
+        value = solver.draw_value(my_hand, opponent_hand, deck, pot, diff)
+    first_diff = parity
+    diff = parity - 2
+    value = solver.draw_value(my_hand, opponent_hand, deck, pot, diff)
+    while value > -1:
+        run.insert(0, value)
+        first_diff = diff
+        diff -= 2
+        value = solver.draw_value(my_hand, opponent_hand, deck, pot, diff)
+    # a run starting at the diff nearest 0 may still begin with sure losses
+    while run and run[0] <= -1:
+        run.pop(0)
+        first_diff += 2
+    values.extend(run)
+    return first_diff, len(run)
+
+def generate_table(path, max_cards=4, max_pot=0):
+    """Solves every position covered by the table and writes it to `path`."""
+    solver = GopsSolver()
+    keys = []
+    records = []
+    values = array("f")
+    for cards in range(1, max_cards + 1):
+        decks = [deck for deck in range(1 << 13) if bin(deck).count("1") == cards]
+        for my_hand, opponent_hand in hand_patterns(cards):
+            for deck in decks:
+                for pot in range(max_pot + 1):
+                    first_value = len(values)
+                    first_diff, count = solve_diff_run(solver, my_hand, opponent_hand, deck, pot, values)
+                    keys.append(table_key(my_hand, opponent_hand, deck, pot))
+                    records.append((first_diff, count, first_value))
+            # keep memory bounded on large tables at the cost of re-solving some subgames
+            if len(solver.transpositions) > MAX_TRANSPOSITIONS:
+                solver.clear()
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    with open(path, "wb") as table_file:
+        table_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, max_cards, max_pot, len(keys), len(values)))
+        array("Q", [keys[i] for i in order]).tofile(table_file)
+        for i in order:
+            table_file.write(RECORD.pack(*records[i]))
+        values.tofile(table_file)
+
+def get_args():
+    parser = argparse.ArgumentParser(description='Generate a gops endgame table')
+    parser.add_argument('path', help='Output file')
+    parser.add_argument('-c', '--max-cards', type=int, default=4,
+                        help='Largest number of cards left in each hand to solve')
+    parser.add_argument('-p', '--max-pot', type=int, default=0,
+                        help='Largest pushed pot to solve')
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = get_args()
+    generate_table(args.path, args.max_cards, args.max_pot)
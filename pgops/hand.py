@@ -1,15 +1,32 @@
 from .card import Card
-from .card_state import CardState
+from .card_state import CardState, HAND_STATES, SEALED_BID_STATES, PLAYZONE_STATES
 from .pile import Pile
 
 class Hand(Pile):
+    __slots__ = ("hand_state", "sealed_bid_state", "playzone_state")
+
     def __init__(self, cards, player_id):
         super().__init__(cards=cards, designation=player_id)
+        self.hand_state = HAND_STATES[player_id]
+        self.sealed_bid_state = SEALED_BID_STATES[player_id]
+        self.playzone_state = PLAYZONE_STATES[player_id]
     
     def count_cards_left_in_hand(self, only_bid_cards=True):
         if only_bid_cards:
-            count = len([card for card in self.cards if card.state.value == self.designation])
-            return count
+            return self.count_cards_in_state(self.hand_state)
         else:
             count = sum([card for card in self.cards if card.state.value == self.designation])
-            return count
\ No newline at end of file
+            return count
+
+    def playable_cards(self):
+        return self.cards_in_state(self.hand_state)
+
+    def cards_in_hand_or_sealed(self):
+        """Cards still in hand, counting the current sealed bid as in hand."""
+        return self.cards_in_states(self.hand_state, self.sealed_bid_state)
+
+    def sealed_bid(self):
+        return self.first_card_in_state(self.sealed_bid_state)
+
+    def playzone_cards(self):
+        return self.cards_in_state(self.playzone_state)
\ No newline at end of file
@@ -0,0 +1,211 @@
+import mmap
+import os
+import struct
+
+MAGIC = b"PGOPSLOG"
+FORMAT_VERSION = 2
+GAME_TYPES = ["gops", "bgops", "bgops_minus"]
+
+# file header: magic, format version, game type
+HEADER = struct.Struct("<8sHB")
+# every record starts with its kind
+GAME = 1
+TURN = 2
+NAME = 3
+END = 4
+# match seed, game index in match, player_a name id, player_b name id
+GAME_RECORD = struct.Struct("<BQIHH")
+# target deck index, player_a bid hand index, player_b bid hand index (-1 for none), result flags, scores after the turn
+TURN_RECORD = struct.Struct("<BbbbBhh")
+# name id, name length; followed by the utf-8 name
+NAME_RECORD = struct.Struct("<BHB")
+# player_a result (0 loss, 1 draw, 2 win), end flags, final scores
+END_RECORD = struct.Struct("<BBBhh")
+
+RESULT_FLAGS = {"a_spy": 1, "b_spy": 2, "bomb": 4, "tie": 8, "a_win": 16, "b_win": 32}
+# why a game ended early; a game without flags was played to the end
+END_FLAGS = {"a_forfeit": 1, "b_forfeit": 2}
+
+def result_flags(result):
+    flags = 0
+    for token in result:
+        flags |= RESULT_FLAGS[token]
+    return flags
+
+def result_tokens(flags):
+    return [token for token, flag in RESULT_FLAGS.items() if flags & flag]
+
+class GameLogWriter:
+    """Appends games to a binary log, one small fixed-size record per turn.
+    Cards are stored as their index in the deck or hand (`Card.card_id`), which together with the
+    game type is enough to rebuild every card. Bot names are written once per writer and referenced by id.
+    Writes go through a buffer of `buffer_size` bytes; call `flush` before the process may exit.
+    """
+    def __init__(self, path, game_type, buffer_size=1 << 16):
+        self.path = path
+        self.game_type = game_type
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as log_file:
+                check_header(log_file.read(HEADER.size), path, game_type)
+        self.file = open(path, "ab", buffering=buffer_size)
+        if not exists:
+            self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, GAME_TYPES.index(game_type)))
+        # ids restart in every writer; readers apply name records in stream order, so appending is safe
+        self.name_ids = {}
+
+    def name_id(self, name):
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.name_ids)
+            self.name_ids[name] = name_id
+            encoded = name.encode("utf-8")[:255]
+            self.file.write(NAME_RECORD.pack(NAME, name_id, len(encoded)) + encoded)
+        return name_id
+
+    def start_game(self, match_seed, game_index, a_name, b_name):
+        a_id = self.name_id(a_name)
+        b_id = self.name_id(b_name)
+        self.file.write(GAME_RECORD.pack(GAME, match_seed if match_seed is not None else 0, game_index, a_id, b_id))
+
+    def log_turn(self, target, a_bid, b_bid, result, a_score, b_score):
+        """`target`, `a_bid` and `b_bid` are Card objects or None; `result` is the list from `evaluate_played_cards`."""
+        self.file.write(TURN_RECORD.pack(
+            TURN,
+            target.card_id if target is not None else -1,
+            a_bid.card_id if a_bid is not None else -1,
+            b_bid.card_id if b_bid is not None else -1,
+            result_flags(result),
+            a_score,
+            b_score
+        ))
+
+    def end_game(self, elo_result, a_score, b_score, a_forfeited=False, b_forfeited=False):
+        """`a_forfeited` and `b_forfeited` mark a game ended by the play clock."""
+        flags = (END_FLAGS["a_forfeit"] if a_forfeited else 0) | (END_FLAGS["b_forfeit"] if b_forfeited else 0)
+        self.file.write(END_RECORD.pack(END, int(elo_result * 2), flags, a_score, b_score))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def check_header(header, path, game_type=None):
+    if len(header) < HEADER.size:
+        raise Exception(f'{path} is not a pgops game log')
+    magic, version, game_type_code = HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise Exception(f'{path} is not a version {FORMAT_VERSION} pgops game log')
+    if game_type is not None and GAME_TYPES[game_type_code] != game_type:
+        raise Exception(f'{path} logs {GAME_TYPES[game_type_code]} games, not {game_type}')
+    return GAME_TYPES[game_type_code]
+
+class LoggedTurn:
+    __slots__ = ("target", "a_bid", "b_bid", "result", "a_score", "b_score")
+
+    def __init__(self, target, a_bid, b_bid, result, a_score, b_score):
+        """Cards are deck or hand indexes, or None."""
+        self.target = target
+        self.a_bid = a_bid
+        self.b_bid = b_bid
+        self.result = result
+        self.a_score = a_score
+        self.b_score = b_score
+
+class LoggedGame:
+    __slots__ = ("game_type", "match_seed", "game_index", "a_name", "b_name", "turns", "elo_result", "a_score", "b_score", "a_forfeited", "b_forfeited")
+
+    def __init__(self, game_type, match_seed, game_index, a_name, b_name):
+        self.game_type = game_type
+        self.match_seed = match_seed
+        self.game_index = game_index
+        self.a_name = a_name
+        self.b_name = b_name
+        self.turns = []
+        # None if the game was cut off before its end record
+        self.elo_result = None
+        self.a_score = None
+        self.b_score = None
+        self.a_forfeited = False
+        self.b_forfeited = False
+
+    def forfeited(self):
+        """True if a bot forfeited the game, which then ended before its last turn."""
+        return self.a_forfeited or self.b_forfeited
+
+    def deck_order(self):
+        """Deck indexes of the targets in the order they were drawn."""
+        return [turn.target for turn in self.turns if turn.target is not None]
+
+class GameLogReader:
+    """Lazily iterates the games in a log written by `GameLogWriter`.
+    The file is memory-mapped, so only the pages being read are loaded.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as log_file:
+            self.game_type = check_header(log_file.read(HEADER.size), path)
+        self.names = {}
+
+    def __iter__(self):
+        return self.games()
+
+    def games(self):
+        """Yields a `LoggedGame` per game, with its turns."""
+        game = None
+        for record in self.records():
+            kind = record[0]
+            if kind == TURN:
+                game.turns.append(LoggedTurn(
+                    record[1] if record[1] >= 0 else None,
+                    record[2] if record[2] >= 0 else None,
+                    record[3] if record[3] >= 0 else None,
+                    result_tokens(record[4]),
+                    record[5],
+                    record[6]
+                ))
+            elif kind == GAME:
+                if game is not None:
+                    yield game
+                game = LoggedGame(self.game_type, record[1], record[2], self.names[record[3]], self.names[record[4]])
+            elif kind == END:
+                game.elo_result = record[1] / 2
+                game.a_forfeited = record[2] & END_FLAGS["a_forfeit"] != 0
+                game.b_forfeited = record[2] & END_FLAGS["b_forfeit"] != 0
+                game.a_score = record[3]
+                game.b_score = record[4]
+        if game is not None:
+            yield game
+
+    def records(self):
+        """Yields every record as a tuple, kind first. Name records are consumed into `self.names`."""
+        with open(self.path, "rb") as log_file:
+            if os.path.getsize(self.path) <= HEADER.size:
+                return
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offset = HEADER.size
+                end = len(data)
+                while offset < end:
+                    kind = data[offset]
+                    if kind == TURN:
+                        yield TURN_RECORD.unpack_from(data, offset)
+                        offset += TURN_RECORD.size
+                    elif kind == GAME:
+                        yield GAME_RECORD.unpack_from(data, offset)
+                        offset += GAME_RECORD.size
+                    elif kind == END:
+                        yield END_RECORD.unpack_from(data, offset)
+                        offset += END_RECORD.size
+                    elif kind == NAME:
+                        kind, name_id, length = NAME_RECORD.unpack_from(data, offset)
+                        offset += NAME_RECORD.size
+                        self.names[name_id] = bytes(data[offset:offset + length]).decode("utf-8")
+                        offset += length
+                    else:
+                        raise Exception(f'{self.path} has an unknown record at byte {offset}')
+
+def read_game_logs(paths):
+    """Yields every `LoggedGame` in `paths`, one file after another (e.g. the shards of a parallel run)."""
+    for path in paths:
+        yield from GameLogReader(path)
\ No newline at end of file
@@ -0,0 +1,124 @@
+import hashlib
+import inspect
+import sqlite3
+
+PAIR_COUNTS = ["matches_played", "games_played", "matches_drawn", "games_drawn"]
+SIDE_COUNTS = ["matches_won", "games_won"]
+
+def source_hash(bot):
+    """Hash of the source of the module defining the bot's class, so editing a bot or a helper in its module
+    counts as a new version. Changes to `PgopsBot` or to the game engine are not detected.
+    """
+    bot_class = type(bot)
+    try:
+        source = inspect.getsource(inspect.getmodule(bot_class))
+    except (OSError, TypeError):
+        source = f'{bot_class.__module__}.{bot_class.__qualname__}'
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+class Ladder:
+    """Persistent ratings and pairwise records in a SQLite file, per game type.
+    Bots are keyed by `bot_name` and the hash of their source. A bot that is new or whose source changed
+    loses its old pair records, so only its pairings are played again; every other pair keeps its record.
+    The orchestrator loads the records before a run, plays the pairings that have no record, and saves the
+    totals and refitted ratings afterwards.
+    """
+    def __init__(self, path, game_type):
+        self.path = path
+        self.game_type = game_type
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS bots (game_type TEXT, name TEXT, source_hash TEXT, "
+                "elo REAL, elo_low REAL, elo_high REAL, PRIMARY KEY (game_type, name))"
+            )
+            # name_a sorts before name_b, as in the orchestrator's pair keys
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS pairs (game_type TEXT, name_a TEXT, name_b TEXT, "
+                + "".join(f'{column} INTEGER, ' for column in PAIR_COUNTS)
+                + "".join(f'a_{column} INTEGER, b_{column} INTEGER, ' for column in SIDE_COUNTS)
+                + "PRIMARY KEY (game_type, name_a, name_b))"
+            )
+
+    def register(self, player_pool):
+        """Adds new bots and drops the pair records of bots whose source changed.
+        Returns the names of the new and changed bots.
+        """
+        stored = dict(self.connection.execute("SELECT name, source_hash FROM bots WHERE game_type = ?", (self.game_type,)))
+        changed = []
+        with self.connection:
+            for player in player_pool:
+                bot_hash = source_hash(player)
+                if stored.get(player.bot_name) == bot_hash:
+                    continue
+                changed.append(player.bot_name)
+                self.connection.execute(
+                    "DELETE FROM pairs WHERE game_type = ? AND (name_a = ? OR name_b = ?)",
+                    (self.game_type, player.bot_name, player.bot_name)
+                )
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO bots VALUES (?, ?, ?, NULL, NULL, NULL)",
+                    (self.game_type, player.bot_name, bot_hash)
+                )
+        return changed
+
+    def ratings(self):
+        """Returns {bot_name: (elo, elo_interval)} for every rated bot."""
+        ratings = {}
+        for name, elo, low, high in self.connection.execute(
+                "SELECT name, elo, elo_low, elo_high FROM bots WHERE game_type = ? AND elo IS NOT NULL", (self.game_type,)):
+            ratings[name] = (elo, (low, high) if low is not None else None)
+        return ratings
+
+    def pair_records(self, bot_names):
+        """Returns {(name_a, name_b): {name_a: counts, name_b: counts}} for every stored pair of `bot_names`.
+        Counts use the keys of the orchestrator's pairwise records.
+        """
+        bot_names = set(bot_names)
+        columns = PAIR_COUNTS + [f'a_{column}' for column in SIDE_COUNTS] + [f'b_{column}' for column in SIDE_COUNTS]
+        pairs = {}
+        for row in self.connection.execute(
+                f'SELECT name_a, name_b, {", ".join(columns)} FROM pairs WHERE game_type = ?', (self.game_type,)):
+            name_a, name_b = row[0], row[1]
+            if name_a not in bot_names or name_b not in bot_names:
+                continue
+            counts = dict(zip(columns, row[2:]))
+            pairs[(name_a, name_b)] = {
+                name_a: self.side_counts(counts, "a", "b"),
+                name_b: self.side_counts(counts, "b", "a"),
+            }
+        return pairs
+
+    def side_counts(self, counts, side, other):
+        return {
+            "matches_played": counts["matches_played"],
+            "games_played": counts["games_played"],
+            "matches_drawn": counts["matches_drawn"],
+            "games_drawn": counts["games_drawn"],
+            "matches_won": counts[f'{side}_matches_won'],
+            "matches_lost": counts[f'{other}_matches_won'],
+            "games_won": counts[f'{side}_games_won'],
+            "games_lost": counts[f'{other}_games_won'],
+        }
+
+    def save(self, records, pairwise_records):
+        """Stores the ratings in `records` and the totals in `pairwise_records`, both in the orchestrator's format."""
+        with self.connection:
+            for name, record in records.items():
+                low, high = record['elo_interval'] if record['elo_interval'] is not None else (None, None)
+                self.connection.execute(
+                    "UPDATE bots SET elo = ?, elo_low = ?, elo_high = ? WHERE game_type = ? AND name = ?",
+                    (record['elo'], low, high, self.game_type, name)
+                )
+            for (name_a, name_b), pair in pairwise_records.items():
+                a = pair[name_a]
+                b = pair[name_b]
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO pairs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.game_type, name_a, name_b,
+                     a['matches_played'], a['games_played'], a['matches_drawn'], a['games_drawn'],
+                     a['matches_won'], b['matches_won'], a['games_won'], b['games_won'])
+                )
+
+    def close(self):
+        self.connection.close()
\ No newline at end of file
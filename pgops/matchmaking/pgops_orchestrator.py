@@ -1,31 +1,126 @@
+import math
+import multiprocessing
 import random
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 from ..pgops import Pgops
+from .game_log import GameLogWriter
+from .ladder import Ladder
+from .profiler import Profiler
+from .ratings import pair_wins, fit_bradley_terry, pairwise_ratings
+
+# set once per worker process by `init_worker` when matches are played in parallel
+worker_orchestrator = None
+
+def init_worker(orchestrator, worker_indexes):
+    global worker_orchestrator
+    worker_orchestrator = orchestrator
+    # every worker appends to its own shard of the game log, numbered from 0 to workers - 1
+    worker_index = worker_indexes.get()
+    if orchestrator.game_log_path is not None:
+        orchestrator.game_log_path = f'{orchestrator.game_log_path}.{worker_index}'
+
+def play_pairing_in_worker(player_a, player_b, match_seeds):
+    """Plays the matches of one pairing in order, as a serial run does.
+    Returns the games of every match and both bots, whose state the caller carries over to their next pairing.
+    """
+    all_match_games = [worker_orchestrator.play_match_games(player_a, player_b, match_seed) for match_seed in match_seeds]
+    # the game is set up again before every game, and may hold unpicklable profiling wrappers
+    for player in (player_a, player_b):
+        player.game = None
+        player.clear_observation()
+    return all_match_games, player_a, player_b
 
 class Orchestrator:
-    SUPPORTED_TOURNAMENT_FORMATS = ["round_robin", "random_matches"]
+    SUPPORTED_TOURNAMENT_FORMATS = ["round_robin", "random_matches", "swiss", "single_elimination", "double_elimination", "ladder"]
     SUPPORTED_GAME_TYPES = ["gops", "bgops", "bgops_minus"]
+    SUPPORTED_MATCH_FORMATS = ["standard", "duplicate"]
+    SUPPORTED_STOPPING_RULES = [None, "sprt", "confidence_interval"]
+    SUPPORTED_CLOCK_POLICIES = ["warn", "forfeit_move", "forfeit_game"]
+    SUPPORTED_RATING_METHODS = ["elo", "bradley_terry"]
     STARTING_ELO = 1500
     ELO_K = 30
-
-    def __init__(self, game_type, player_pool, tournament_format, matches_per_pairing=3, games_per_match=1000, num_tournaments=1):
+    # z value of the Bradley-Terry rating intervals (95%)
+    RATING_Z = 1.96
+
+    # early stopping never ends a match before this many games
+    STOPPING_MIN_GAMES = 30
+    # SPRT of H0: player_a scores 0.5 - margin against H1: player_a scores 0.5 + margin
+    SPRT_MARGIN = 0.05
+    SPRT_ALPHA = 0.05
+    SPRT_BETA = 0.05
+    # z value of the Wilson interval on player_a's score rate (99%)
+    CONFIDENCE_Z = 2.576
+    # pairings tried while searching for a swiss round without repeat pairings
+    SWISS_SEARCH_LIMIT = 100000
+    # engine methods timed when profiling
+    PROFILED_ENGINE_PHASES = ["next_turn", "evaluate_played_cards", "is_game_over", "score_players"]
+
+    def __init__(self, game_type, player_pool, tournament_format, matches_per_pairing=3, games_per_match=1000, num_tournaments=1, workers=1, visualize=True, heatmap_path=None, seed=None, match_format="standard", stopping_rule=None, move_time_limit=None, game_time_limit=None, clock_policy="warn", profile=False, profile_path=None, game_log_path=None, rating_method=None, swiss_rounds=None, ladder_path=None):
         if game_type not in self.SUPPORTED_GAME_TYPES:
             raise Exception(f'Game type "{game_type}" not supported. Pick from {self.SUPPORTED_GAME_TYPES}')
         else:
             self.game_type = game_type
 
         if tournament_format not in self.SUPPORTED_TOURNAMENT_FORMATS:
-            raise Exception(f'Tournament style "{tournament_style}" not supported. Pick from: {self.SUPPORTED_TOURNAMENT_FORMATS}')
+            raise Exception(f'Tournament format "{tournament_format}" not supported. Pick from: {self.SUPPORTED_TOURNAMENT_FORMATS}')
         else:
             self.tournament_format = tournament_format
+
+        if match_format not in self.SUPPORTED_MATCH_FORMATS:
+            raise Exception(f'Match format "{match_format}" not supported. Pick from: {self.SUPPORTED_MATCH_FORMATS}')
+        else:
+            self.match_format = match_format
+
+        if stopping_rule not in self.SUPPORTED_STOPPING_RULES:
+            raise Exception(f'Stopping rule "{stopping_rule}" not supported. Pick from: {self.SUPPORTED_STOPPING_RULES}')
+        else:
+            self.stopping_rule = stopping_rule
+
+        if clock_policy not in self.SUPPORTED_CLOCK_POLICIES:
+            raise Exception(f'Clock policy "{clock_policy}" not supported. Pick from: {self.SUPPORTED_CLOCK_POLICIES}')
+        else:
+            self.clock_policy = clock_policy
+
+        # online Elo by default; the ladder refits stored ratings from all stored games, which online Elo cannot do
+        if rating_method is None:
+            rating_method = "bradley_terry" if tournament_format == "ladder" else "elo"
+        if rating_method not in self.SUPPORTED_RATING_METHODS:
+            raise Exception(f'Rating method "{rating_method}" not supported. Pick from: {self.SUPPORTED_RATING_METHODS}')
+        else:
+            self.rating_method = rating_method
+
+        if tournament_format == "ladder":
+            if ladder_path is None:
+                raise Exception('The ladder tournament format needs a ladder_path')
+            if rating_method != "bradley_terry":
+                raise Exception(f'Rating method "{rating_method}" not supported by the ladder tournament format. Use "bradley_terry"')
+        self.ladder_path = ladder_path
         
         self.player_pool = player_pool
         self.matches_per_pairing = matches_per_pairing
         self.games_per_match = games_per_match
         self.num_tournaments = num_tournaments
+        # rounds per swiss tournament; None plays ceil(log2(n)) rounds
+        self.swiss_rounds = swiss_rounds
+        self.workers = workers
+        self.visualize = visualize
+        self.heatmap_path = heatmap_path
+        # play clock in seconds; None disables a limit
+        self.move_time_limit = move_time_limit
+        self.game_time_limit = game_time_limit
+        # per-method timing histograms for bots and the engine; None when profiling is off
+        self.profile_path = profile_path
+        self.profiler = Profiler() if profile or profile_path is not None else None
+        # binary log of every turn; opened on the first match played in each process
+        self.game_log_path = game_log_path
+        self.game_log = None
+        # worker processes, started on the first parallel batch and kept for the whole run
+        self.executor = None
+        # drives the schedule and the seed of every match, so a tournament seed reproduces the whole run
+        self.seed = seed
+        self.rng = random.Random(seed)
 
         print(f'Starting {tournament_format} tournament of {game_type} with {len(player_pool)} players, {matches_per_pairing} matches per pairing, {games_per_match} games per match.')
 
@@ -33,11 +128,34 @@ class Orchestrator:
         self.pairwise_records = {}
 
         self.pairwise_results = {}
+        # bot names ranked best first, for every swiss or elimination tournament played
+        self.standings = []
 
         if tournament_format == "round_robin":
             self.run_round_robin_tournament()
         elif tournament_format == "random_matches":
             self.run_random_tournament()
+        elif tournament_format == "swiss":
+            self.run_swiss_tournament()
+        elif tournament_format == "single_elimination":
+            self.run_elimination_tournament(lives=1)
+        elif tournament_format == "double_elimination":
+            self.run_elimination_tournament(lives=2)
+        elif tournament_format == "ladder":
+            self.run_ladder_tournament()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.game_log is not None:
+            self.game_log.close()
+            self.game_log = None
+
+    def __getstate__(self):
+        # worker processes get their own game log and never start workers themselves
+        state = self.__dict__.copy()
+        state['executor'] = None
+        state['game_log'] = None
+        return state
 
     def initialize_records(self):
         records = {}
@@ -45,6 +163,8 @@ class Orchestrator:
             records[player.bot_name] = {
                 "player": player,
                 "elo": self.STARTING_ELO,
+                # 95% interval of the Bradley-Terry rating; None with online Elo
+                "elo_interval": None,
                 "games_played": 0,
                 "matches_played": 0,
                 "games_won": 0,
@@ -52,7 +172,8 @@ class Orchestrator:
                 "games_drawn": 0,
                 "matches_won": 0,
                 "matches_lost": 0,
-                "matches_drawn": 0
+                "matches_drawn": 0,
+                "timing": self.initialize_timing()
             }
         return records
     
@@ -64,10 +185,43 @@ class Orchestrator:
             "matches_played": 0,
             "games_won": 0,
             "games_lost": 0,
-            "games_drawn": 0
+            "games_drawn": 0,
+            "matches_won": 0,
+            "matches_lost": 0,
+            "matches_drawn": 0
         }
         return record
 
+    def initialize_timing(self):
+        """Time a bot spent in `select_and_play_card`, `turn_over` and `game_over`, in seconds."""
+        timing = {
+            "calls": 0,
+            "total_time": 0.0,
+            "max_call_time": 0.0,
+            "games": 0,
+            "max_game_time": 0.0,
+            "moves_over_limit": 0,
+            "games_over_limit": 0,
+            "moves_forfeited": 0,
+            "games_forfeited": 0
+        }
+        return timing
+
+    def merge_timing(self, timing, other):
+        for key, value in other.items():
+            if key.startswith("max_"):
+                timing[key] = max(timing[key], value)
+            else:
+                timing[key] += value
+
+    def slowest_bots(self):
+        """Returns (bot_name, mean seconds per call) for every bot, slowest first."""
+        mean_times = []
+        for bot_name, record in self.records.items():
+            timing = record['timing']
+            mean_times.append((bot_name, timing['total_time'] / timing['calls'] if timing['calls'] > 0 else 0))
+        return sorted(mean_times, key=lambda x: x[1], reverse=True)
+
     def round_robin_schedule(self, n):
         """
         Generate a round-robin tournament schedule for `n` teams.
@@ -86,34 +240,350 @@ class Orchestrator:
 
     def run_round_robin_tournament(self):
         for i in range(self.num_tournaments):
-            random.shuffle(self.player_pool)
+            self.rng.shuffle(self.player_pool)
             schedule = self.round_robin_schedule(len(self.player_pool))
+            pairings = []
             for tournament_round in schedule:
                 for pairing in tournament_round:
                     player_a = self.player_pool[pairing[0]]
                     player_b = self.player_pool[pairing[1]]
-                    self.play_matches(player_a, player_b)
+                    pairings.append((player_a, player_b))
+            self.play_pairings(pairings)
         
-        self.pretty_print(self.records)
-        self.visualize_results()
+        self.report_results()
 
     def run_random_tournament(self):
+        pairings = []
         for i in range(self.num_tournaments):
-            players = random.sample(self.player_pool, 2)
+            players = self.rng.sample(self.player_pool, 2)
             player_a = players[0]
             player_b = players[1]
-            self.play_matches(player_a, player_b)
+            pairings.append((player_a, player_b))
+        self.play_pairings(pairings)
         
-        self.pretty_print(self.records)
-        self.visualize_results()
+        self.report_results()
+
+    def run_swiss_tournament(self):
+        """Swiss system: every round pairs bots with equal or close tournament points, never pairing
+        the same bots twice in one tournament, so n bots play about n/2 * log2(n) pairings instead of n²/2.
+        A pairing is won by the bot that won more of its games; a win scores 1 point, a draw 0.5.
+        Bots are ranked by points, then by rating, which is refitted before every round.
+        With an odd number of bots, the lowest ranked bot without a bye sits out and scores 1 point.
+        """
+        rounds = self.swiss_rounds
+        if rounds is None:
+            rounds = math.ceil(math.log2(len(self.player_pool))) if len(self.player_pool) > 1 else 0
+        for i in range(self.num_tournaments):
+            self.rng.shuffle(self.player_pool)
+            points = {player.bot_name: 0.0 for player in self.player_pool}
+            played = set()
+            byes = set()
+            for tournament_round in range(rounds):
+                self.update_ratings()
+                ranked = self.swiss_ranking(points)
+                if len(ranked) % 2 == 1:
+                    bye = next((player for player in reversed(ranked) if player.bot_name not in byes), ranked[-1])
+                    byes.add(bye.bot_name)
+                    points[bye.bot_name] += 1
+                    ranked.remove(bye)
+                pairings = self.swiss_pairings(ranked, played)
+                for (player_a, player_b), result in zip(pairings, self.play_pairings(pairings)):
+                    played.add(frozenset((player_a.bot_name, player_b.bot_name)))
+                    a_points = 1.0 if result[0] > result[1] else 0.5 if result[0] == result[1] else 0.0
+                    points[player_a.bot_name] += a_points
+                    points[player_b.bot_name] += 1 - a_points
+            self.update_ratings()
+            standings = [player.bot_name for player in self.swiss_ranking(points)]
+            self.standings.append(standings)
+            print(f'Swiss tournament {i + 1} winner: {standings[0]} ({points[standings[0]]} points in {rounds} rounds)')
+
+        self.report_results()
+
+    def swiss_ranking(self, points):
+        """Players ordered by tournament points, then rating; the shuffled pool order breaks remaining ties."""
+        return sorted(self.player_pool, key=lambda x: (points[x.bot_name], self.records[x.bot_name]['elo']), reverse=True)
+
+    def swiss_pairings(self, ranked, played):
+        """Pairs each bot, best ranked first, with the next ranked bot it has not played yet,
+        backtracking when that leaves bots that can only be paired again.
+        Only if no round without repeat pairings is found within `SWISS_SEARCH_LIMIT` tries,
+        each bot is paired with the next ranked bot it has not played, or the next ranked one.
+        """
+        def new_pairing(player_a, player_b):
+            return frozenset((player_a.bot_name, player_b.bot_name)) not in played
+
+        def search(unpaired, budget):
+            if len(unpaired) < 2:
+                return []
+            player_a = unpaired[0]
+            for opponent in unpaired[1:]:
+                if budget[0] <= 0:
+                    return None
+                if not new_pairing(player_a, opponent):
+                    continue
+                budget[0] -= 1
+                pairings = search([player for player in unpaired[1:] if player is not opponent], budget)
+                if pairings is not None:
+                    return [(player_a, opponent)] + pairings
+            return None
+
+        # a bot that has played every other bot rules out a round without repeats
+        if all(any(new_pairing(player, other) for other in ranked if other is not player) for player in ranked):
+            pairings = search(list(ranked), [self.SWISS_SEARCH_LIMIT])
+            if pairings is not None:
+                return pairings
+        unpaired = list(ranked)
+        pairings = []
+        while len(unpaired) > 1:
+            player_a = unpaired.pop(0)
+            opponent = next((player for player in unpaired if frozenset((player_a.bot_name, player.bot_name)) not in played), unpaired[0])
+            unpaired.remove(opponent)
+            pairings.append((player_a, opponent))
+        return pairings
+
+    def run_elimination_tournament(self, lives=1):
+        """Knockout: a bot is out after losing `lives` pairings (1 for single, 2 for double elimination).
+        Bots are seeded by rating. Every round, bots with the same number of losses are paired best seed
+        against worst seed, and the best seed of an odd group gets a bye. When one bot is left in each of
+        two groups, they meet, so the double elimination final is replayed if the unbeaten bot loses it.
+        A pairing is won by the bot that won more of its games, and drawn pairings go to the better seed.
+        Every pairing knocks out at most one bot, so n bots play at most lives * n - 1 pairings.
+        """
+        for i in range(self.num_tournaments):
+            self.rng.shuffle(self.player_pool)
+            self.update_ratings()
+            seeds = sorted(self.player_pool, key=lambda x: self.records[x.bot_name]['elo'], reverse=True)
+            losses = {player.bot_name: 0 for player in seeds}
+            eliminated = []
+            while len(seeds) > 1:
+                groups = {}
+                for player in seeds:
+                    groups.setdefault(losses[player.bot_name], []).append(player)
+                pairings = []
+                for group in groups.values():
+                    for j in range(len(group) // 2):
+                        pairings.append((group[len(group) % 2 + j], group[-1 - j]))
+                if not pairings:
+                    pairings.append(tuple(seeds))
+                for (player_a, player_b), result in zip(pairings, self.play_pairings(pairings)):
+                    # player_a is always the better seed
+                    loser = player_b if result[0] >= result[1] else player_a
+                    losses[loser.bot_name] += 1
+                    if losses[loser.bot_name] == lives:
+                        seeds.remove(loser)
+                        eliminated.append(loser.bot_name)
+            standings = [seeds[0].bot_name] + eliminated[::-1] if seeds else eliminated[::-1]
+            self.standings.append(standings)
+            print(f'{"Single" if lives == 1 else "Double"} elimination tournament {i + 1} winner: {standings[0]}')
+
+        self.report_results()
+
+    def run_ladder_tournament(self):
+        """Plays only the pairings missing from the ladder at `ladder_path`, then refits and stores the ratings.
+        Adding one bot to a rated pool of n bots plays n pairings instead of a full round robin.
+        Records start from the ladder's totals, so the results cover every game stored for the pool.
+        """
+        ladder = Ladder(self.ladder_path, self.game_type)
+        changed = ladder.register(self.player_pool)
+        for bot_name, (elo, elo_interval) in ladder.ratings().items():
+            if bot_name in self.records:
+                self.records[bot_name]['elo'] = elo
+                self.records[bot_name]['elo_interval'] = elo_interval
+        for pair, counts in ladder.pair_records(self.records).items():
+            self.pairwise_records[pair] = {}
+            for bot_name in pair:
+                self.pairwise_records[pair][bot_name] = self.initialize_record(bot_name)
+                self.pairwise_records[pair][bot_name].update(counts[bot_name])
+                for key, value in counts[bot_name].items():
+                    self.records[bot_name][key] += value
+
+        self.rng.shuffle(self.player_pool)
+        pairings = []
+        for i, player_a in enumerate(self.player_pool):
+            for player_b in self.player_pool[i + 1:]:
+                if tuple(sorted((player_a.bot_name, player_b.bot_name))) not in self.pairwise_records:
+                    pairings.append((player_a, player_b))
+        print(f'Ladder {self.ladder_path}: {len(changed)} new or changed bots, {len(pairings)} pairings to play.')
+        self.play_pairings(pairings)
+        self.update_ratings()
+        ladder.save(self.records, self.pairwise_records)
+        ladder.close()
+
+        self.report_results()
+
+    def play_pairings(self, pairings):
+        """Plays `matches_per_pairing` matches for each (player_a, player_b) pairing.
+        Returns (player_a games won, player_b games won) for each pairing, summed over its matches.
+        """
+        if self.workers > 1:
+            return self.play_pairings_in_parallel(pairings)
+        return [self.play_matches(player_a, player_b) for player_a, player_b in pairings]
+
+    def play_pairings_in_parallel(self, pairings):
+        """Distributes pairings across `self.workers` processes, with the same results as a serial run.
+        Pairings are played in waves in which no bot plays twice, keeping each bot's pairings in schedule order.
+        A worker plays all matches of a pairing in order and sends both bots back, and their state is copied
+        into the bots here before their next pairing, so bots carry memory across matches as in a serial run.
+        Results are merged in schedule order, which keeps Elo updates reproducible.
+        """
+        match_seeds = [[self.rng.getrandbits(64) for i in range(self.matches_per_pairing)] for pairing in pairings]
+        waves = []
+        last_wave = {}
+        for j, (player_a, player_b) in enumerate(pairings):
+            wave = max(last_wave.get(player_a.bot_name, -1), last_wave.get(player_b.bot_name, -1)) + 1
+            last_wave[player_a.bot_name] = wave
+            last_wave[player_b.bot_name] = wave
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(j)
+        all_pairing_games = [None] * len(pairings)
+        executor = self.get_executor()
+        for wave in waves:
+            futures = [executor.submit(play_pairing_in_worker, pairings[j][0], pairings[j][1], match_seeds[j]) for j in wave]
+            for j, future in zip(wave, futures):
+                all_match_games, player_a, player_b = future.result()
+                pairings[j][0].__dict__.update(player_a.__dict__)
+                pairings[j][1].__dict__.update(player_b.__dict__)
+                all_pairing_games[j] = all_match_games
+        pairing_results = []
+        for (player_a, player_b), seeds, all_match_games in zip(pairings, match_seeds, all_pairing_games):
+            a_games_won = 0
+            b_games_won = 0
+            for match_seed, (game_results, a_timing, b_timing, profiler) in zip(seeds, all_match_games):
+                if profiler is not None:
+                    self.profiler.merge(profiler)
+                match_results = self.record_match_games(player_a, player_b, game_results, match_seed, a_timing, b_timing)
+                self.update_match_results(player_a, player_b, match_results)
+                self.update_pairwise_records(player_a, player_b, match_results)
+                a_games_won += match_results['a_games_won']
+                b_games_won += match_results['b_games_won']
+            pairing_results.append((a_games_won, b_games_won))
+        return pairing_results
+
+    def get_executor(self):
+        """The pool of `self.workers` processes, started once per run, so that formats that play in rounds
+        do not start new workers (and game log shards) every round.
+        """
+        if self.executor is None:
+            worker_indexes = multiprocessing.Queue()
+            for i in range(self.workers):
+                worker_indexes.put(i)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(self, worker_indexes))
+        return self.executor
 
     def play_matches(self, player_a, player_b):
+        """Plays `matches_per_pairing` matches and returns (player_a games won, player_b games won)."""
+        a_games_won = 0
+        b_games_won = 0
         for i in range(self.matches_per_pairing):
-            match_results = self.play_match(player_a, player_b)
+            match_results = self.play_match(player_a, player_b, self.rng.getrandbits(64))
             self.update_match_results(player_a, player_b, match_results)
             self.update_pairwise_records(player_a, player_b, match_results)
-
-    def play_match(self, player_a, player_b):
+            a_games_won += match_results['a_games_won']
+            b_games_won += match_results['b_games_won']
+        return (a_games_won, b_games_won)
+
+    def play_match(self, player_a, player_b, match_seed=None):
+        game_results, a_timing, b_timing, profiler = self.play_match_games(player_a, player_b, match_seed)
+        if profiler is not None:
+            self.profiler.merge(profiler)
+        return self.record_match_games(player_a, player_b, game_results, match_seed, a_timing, b_timing)
+
+    def play_match_games(self, player_a, player_b, match_seed=None):
+        """Plays one match and returns (game_results, a_timing, b_timing, profiler).
+        `game_results` holds (elo_result, a_score, b_score) for each game, from player_a's perspective,
+        the timings are each bot's play clock totals for the match and `profiler` is the match's
+        `Profiler`, or None when profiling is off.
+        Every game reseeds the deck and both bots from `match_seed`, so a match can be replayed exactly.
+
+        In the "duplicate" match format every deal is played twice with seats swapped.
+        Both games of a deal use the same deck order and the same seed for each bot,
+        so the luck of the deal cancels out of the paired score differential.
+        """
+        match_rng = random.Random(match_seed)
+        deck_rng = random.Random()
+        a_rng = random.Random()
+        b_rng = random.Random()
+        game = Pgops(self.game_type, rng=deck_rng)
+        # picks the cards of forfeited moves, apart from the deck and bot streams
+        clock_rng = random.Random(f'clock {match_seed}')
+        if self.game_log_path is not None and self.game_log is None:
+            self.game_log = GameLogWriter(self.game_log_path, self.game_type)
+        profiler = None
+        if self.profiler is not None:
+            profiler = Profiler()
+            profiler.instrument(game, "engine", self.PROFILED_ENGINE_PHASES)
+        game_results = []
+        a_timing = self.initialize_timing()
+        b_timing = self.initialize_timing()
+        # games won, lost and drawn by player_a, for the stopping rule
+        tally = {1: 0, 0: 0, 0.5: 0}
+        if self.match_format == "duplicate":
+            for j in range(max(1, self.games_per_match // 2)):
+                deck_rng.seed(match_rng.getrandbits(64))
+                a_seed = match_rng.getrandbits(64)
+                b_seed = match_rng.getrandbits(64)
+                a_rng.seed(a_seed)
+                b_rng.seed(b_seed)
+                if self.game_log is not None:
+                    self.game_log.start_game(match_seed, 2 * j, player_a.bot_name, player_b.bot_name)
+                game_results.append(self.play_game(player_a, player_b, game, a_rng, b_rng, a_timing=a_timing, b_timing=b_timing, profiler=profiler, clock_rng=clock_rng))
+                a_rng.seed(a_seed)
+                b_rng.seed(b_seed)
+                if self.game_log is not None:
+                    self.game_log.start_game(match_seed, 2 * j + 1, player_b.bot_name, player_a.bot_name)
+                swapped = self.play_game(player_b, player_a, game, b_rng, a_rng, deck_order=game.deck.draw_order, a_timing=b_timing, b_timing=a_timing, profiler=profiler, clock_rng=clock_rng)
+                game_results.append((1 - swapped[0], swapped[2], swapped[1]))
+                if self.stopping_rule is not None:
+                    tally[game_results[-2][0]] += 1
+                    tally[game_results[-1][0]] += 1
+                    if self.stop_reason(tally[1], tally[0], tally[0.5]) is not None:
+                        break
+        else:
+            for j in range(self.games_per_match):
+                deck_rng.seed(match_rng.getrandbits(64))
+                a_rng.seed(match_rng.getrandbits(64))
+                b_rng.seed(match_rng.getrandbits(64))
+                if self.game_log is not None:
+                    self.game_log.start_game(match_seed, j, player_a.bot_name, player_b.bot_name)
+                game_results.append(self.play_game(player_a, player_b, game, a_rng, b_rng, a_timing=a_timing, b_timing=b_timing, profiler=profiler, clock_rng=clock_rng))
+                if self.stopping_rule is not None:
+                    tally[game_results[-1][0]] += 1
+                    if self.stop_reason(tally[1], tally[0], tally[0.5]) is not None:
+                        break
+        # worker processes can exit without flushing, so every match ends on disk
+        if self.game_log is not None:
+            self.game_log.flush()
+        return game_results, a_timing, b_timing, profiler
+
+    def stop_reason(self, wins, losses, draws):
+        """Returns why a match can stop early given player_a's record so far, or None to keep playing.
+        Draws count as half a win and half a loss.
+        """
+        games = wins + losses + draws
+        if self.stopping_rule is None or games < self.STOPPING_MIN_GAMES:
+            return None
+        points = wins + draws / 2
+        if self.stopping_rule == "sprt":
+            p0 = 0.5 - self.SPRT_MARGIN
+            p1 = 0.5 + self.SPRT_MARGIN
+            llr = points * math.log(p1 / p0) + (games - points) * math.log((1 - p1) / (1 - p0))
+            if llr >= math.log((1 - self.SPRT_BETA) / self.SPRT_ALPHA):
+                return "sprt_a_stronger"
+            if llr <= math.log(self.SPRT_BETA / (1 - self.SPRT_ALPHA)):
+                return "sprt_b_stronger"
+        elif self.stopping_rule == "confidence_interval":
+            z = self.CONFIDENCE_Z
+            rate = points / games
+            center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+            half_width = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / (1 + z * z / games)
+            if center - half_width > 0.5:
+                return "confidence_interval_a_stronger"
+            if center + half_width < 0.5:
+                return "confidence_interval_b_stronger"
+        return None
+
+    def record_match_games(self, player_a, player_b, game_results, match_seed=None, a_timing=None, b_timing=None):
         match_results = {
             'a_bot_name':player_a.bot_name,
             'b_bot_name':player_b.bot_name,
@@ -122,27 +592,78 @@ class Orchestrator:
             'b_games_won': 0,
             'b_games_lost': 0,
             'games_drawn': 0,
-            'games_played': 0
+            'games_played': 0,
+            'match_seed': match_seed,
+            'a_timing': a_timing if a_timing is not None else self.initialize_timing(),
+            'b_timing': b_timing if b_timing is not None else self.initialize_timing()
         }
-
-        game = Pgops(self.game_type)
-
-        for j in range(self.games_per_match):
-            result = self.play_game(player_a, player_b, game)
-            match_results = self.update_game_results(match_results, result)
-        
+        for elo_result, a_score, b_score in game_results:
+            match_results = self.update_game_results(match_results, elo_result)
+        if self.match_format == "duplicate":
+            self.record_paired_differentials(match_results, game_results)
+        # the match stopped at the first game where the rule fired, so its final record reproduces the reason
+        stop_reason = self.stop_reason(match_results['a_games_won'], match_results['a_games_lost'], match_results['games_drawn'])
+        match_results['stop_reason'] = stop_reason if stop_reason is not None else "completed"
         return match_results
 
-    def play_game(self, player_a, player_b, game):
-        player_a.setup(game, "player_a")
-        player_b.setup(game, "player_b")
-        game.new_game()
+    def record_paired_differentials(self, match_results, game_results):
+        """Adds the mean and standard error of player_a's score differential per duplicate deal."""
+        differentials = []
+        for first, second in zip(game_results[0::2], game_results[1::2]):
+            differentials.append((first[1] - first[2]) + (second[1] - second[2]))
+        deals = len(differentials)
+        mean = sum(differentials) / deals if deals > 0 else 0
+        if deals > 1:
+            variance = sum((d - mean) ** 2 for d in differentials) / (deals - 1)
+            stderr = (variance / deals) ** 0.5
+        else:
+            stderr = 0
+        match_results['deals_played'] = deals
+        match_results['paired_score_differential'] = mean
+        match_results['paired_score_differential_stderr'] = stderr
+
+    def play_game(self, player_a, player_b, game, a_rng=None, b_rng=None, deck_order=None, a_timing=None, b_timing=None, profiler=None, clock_rng=None):
+        """Plays one game and returns (elo_result, a_score, b_score).
+        Time spent in each bot's `select_and_play_card`, `turn_over` and `game_over` is added to
+        `a_timing` and `b_timing` and checked against the play clock by `clock_penalty`.
+        Forfeited moves are replaced with cards drawn from `clock_rng`, and bots see the card actually
+        played as `my_card_played` in `turn_over`.
+        A bot that forfeits the game loses it, whatever the score.
+        Bot calls are also recorded in `profiler`, if given.
+        Turns are written to `self.game_log`, if open, after the caller has started the game there.
+        """
+        if a_timing is None:
+            a_timing = self.initialize_timing()
+        if b_timing is None:
+            b_timing = self.initialize_timing()
+        player_a.setup(game, "player_a", a_rng)
+        player_b.setup(game, "player_b", b_rng)
+        game.new_game(deck_order)
+        a_game_time = 0.0
+        b_game_time = 0.0
+        a_forfeited = False
+        b_forfeited = False
         game_done = False
         while not game_done:
             bid_card = game.next_turn()
-            a_card = player_a.select_and_play_card()
-            b_card = player_b.select_and_play_card()
+            a_card, elapsed = self.timed_call(a_timing, profiler, player_a.select_and_play_card)
+            a_game_time += elapsed
+            penalty = self.clock_penalty(player_a, a_timing, elapsed, a_game_time, move=True)
+            if penalty == "forfeit_move":
+                a_card = self.forfeit_move(game, "player_a", a_timing, clock_rng)
+            a_forfeited = penalty == "forfeit_game"
+            b_card, elapsed = self.timed_call(b_timing, profiler, player_b.select_and_play_card)
+            b_game_time += elapsed
+            penalty = self.clock_penalty(player_b, b_timing, elapsed, b_game_time, move=True)
+            if penalty == "forfeit_move":
+                b_card = self.forfeit_move(game, "player_b", b_timing, clock_rng)
+            b_forfeited = penalty == "forfeit_game"
+            if a_forfeited or b_forfeited:
+                break
             result = game.evaluate_played_cards()
+            if self.game_log is not None:
+                score = game.score_players()
+                self.game_log.log_turn(bid_card, a_card, b_card, result, score[0], score[1])
             a_result = ""
             b_result = ""
             if len(result) > 1:
@@ -166,19 +687,89 @@ class Orchestrator:
             elif result[0] == "b_spy":
                 a_result = "opponent_spy"
                 b_result = "my_spy"
-            player_a.turn_over(a_card, b_card, bid_card, a_result)
-            player_b.turn_over(b_card, a_card, bid_card, b_result)
+            elapsed = self.timed_call(a_timing, profiler, player_a.turn_over, a_card, b_card, bid_card, a_result)[1]
+            a_game_time += elapsed
+            a_forfeited = self.clock_penalty(player_a, a_timing, elapsed, a_game_time) == "forfeit_game"
+            elapsed = self.timed_call(b_timing, profiler, player_b.turn_over, b_card, a_card, bid_card, b_result)[1]
+            b_game_time += elapsed
+            b_forfeited = self.clock_penalty(player_b, b_timing, elapsed, b_game_time) == "forfeit_game"
+            if a_forfeited or b_forfeited:
+                break
             game_done = game.is_game_over()
         score = game.score_players()
-        player_a.game_over(score[0], score[1])
-        player_b.game_over(score[1], score[0])
-        if score[0] > score[1]:
+        a_game_time += self.timed_call(a_timing, profiler, player_a.game_over, score[0], score[1])[1]
+        b_game_time += self.timed_call(b_timing, profiler, player_b.game_over, score[1], score[0])[1]
+        for timing, game_time, forfeited in ((a_timing, a_game_time, a_forfeited), (b_timing, b_game_time, b_forfeited)):
+            timing['games'] += 1
+            timing['max_game_time'] = max(timing['max_game_time'], game_time)
+            if forfeited:
+                timing['games_forfeited'] += 1
+        if a_forfeited != b_forfeited:
+            elo_result = 0 if a_forfeited else 1
+        elif a_forfeited or score[0] == score[1]:
+            elo_result = 0.5
+        elif score[0] > score[1]:
             elo_result = 1
-        elif score[1] > score[0]:
-            elo_result = 0
         else:
-            elo_result = 0.5
-        return elo_result
+            elo_result = 0
+        if self.game_log is not None:
+            self.game_log.end_game(elo_result, score[0], score[1], a_forfeited, b_forfeited)
+        return (elo_result, score[0], score[1])
+
+    def timed_call(self, timing, profiler, method, *args):
+        """Calls a bot method on the play clock. Returns (result, elapsed seconds)."""
+        start = time.perf_counter()
+        result = method(*args)
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.record(method.__self__.bot_name, method.__name__, elapsed)
+        timing['calls'] += 1
+        timing['total_time'] += elapsed
+        if elapsed > timing['max_call_time']:
+            timing['max_call_time'] = elapsed
+        return result, elapsed
+
+    def clock_penalty(self, player, timing, elapsed, game_time, move=False):
+        """Checks a call that took `elapsed` seconds, with `game_time` spent by the bot so far this game.
+        Returns None, "forfeit_move" or "forfeit_game" according to `clock_policy`.
+        Only `select_and_play_card` calls (`move=True`) are held to `move_time_limit`; a bot that has used up
+        `game_time_limit` is penalized on every later call that game.
+        The "warn" policy prints the first move and the first game over a limit in each match.
+        """
+        over_move = move and self.move_time_limit is not None and elapsed > self.move_time_limit
+        over_game = self.game_time_limit is not None and game_time > self.game_time_limit
+        if not over_move and not over_game:
+            return None
+        if over_move:
+            timing['moves_over_limit'] += 1
+            if self.clock_policy == "warn" and timing['moves_over_limit'] == 1:
+                print(f'Warning: {player.bot_name} took {elapsed:.3f}s for a move; the limit is {self.move_time_limit}s')
+        # count the game once, on the call that crossed the limit
+        if over_game and game_time - elapsed <= self.game_time_limit:
+            timing['games_over_limit'] += 1
+            if self.clock_policy == "warn" and timing['games_over_limit'] == 1:
+                print(f'Warning: {player.bot_name} took over {self.game_time_limit}s for a game')
+        if self.clock_policy == "warn" or self.clock_policy == "forfeit_move" and not move:
+            return None
+        return self.clock_policy
+
+    def forfeit_move(self, game, player_name, timing, rng=None):
+        """Replaces the sealed bid of a move that broke the play clock with a card drawn by `rng` from the same hand.
+        Returns the card played instead.
+        """
+        player = game.players[player_name]
+        if player.frozen:
+            return None
+        sealed_bid = player.hand.sealed_bid()
+        if sealed_bid is not None:
+            sealed_bid.change_state(player.hand.hand_state)
+        hand_cards = player.hand.playable_cards()
+        if len(hand_cards) == 0:
+            return None
+        timing['moves_forfeited'] += 1
+        if rng is None:
+            rng = random.Random()
+        return player.play_specific_card(rng.choice(hand_cards))
 
     def update_game_results(self, match_results, elo_result):
         pair_key = tuple(sorted((match_results['a_bot_name'], match_results['b_bot_name'])))
@@ -187,13 +778,15 @@ class Orchestrator:
                 match_results['a_bot_name']: self.initialize_record(match_results['a_bot_name']),
                 match_results['b_bot_name']: self.initialize_record(match_results['b_bot_name'])
             }
-        new_elo = self.record_match(self.records[match_results['a_bot_name']]['elo'], self.records[match_results['b_bot_name']]['elo'], elo_result)
-        new_pairwise_elo = self.record_match(self.pairwise_records[pair_key][match_results['a_bot_name']]['pairwise_elo'], self.pairwise_records[pair_key][match_results['b_bot_name']]['pairwise_elo'], elo_result)
-
-        self.records[match_results['a_bot_name']]['elo'] = new_elo[0]
-        self.records[match_results['b_bot_name']]['elo'] = new_elo[1]
-        self.pairwise_records[pair_key][match_results['a_bot_name']]['pairwise_elo'] = new_pairwise_elo[0]
-        self.pairwise_records[pair_key][match_results['b_bot_name']]['pairwise_elo'] = new_pairwise_elo[1]
+        # Bradley-Terry ratings are fitted from the win counts in `update_ratings` instead
+        if self.rating_method == "elo":
+            new_elo = self.record_match(self.records[match_results['a_bot_name']]['elo'], self.records[match_results['b_bot_name']]['elo'], elo_result)
+            new_pairwise_elo = self.record_match(self.pairwise_records[pair_key][match_results['a_bot_name']]['pairwise_elo'], self.pairwise_records[pair_key][match_results['b_bot_name']]['pairwise_elo'], elo_result)
+
+            self.records[match_results['a_bot_name']]['elo'] = new_elo[0]
+            self.records[match_results['b_bot_name']]['elo'] = new_elo[1]
+            self.pairwise_records[pair_key][match_results['a_bot_name']]['pairwise_elo'] = new_pairwise_elo[0]
+            self.pairwise_records[pair_key][match_results['b_bot_name']]['pairwise_elo'] = new_pairwise_elo[1]
         
         match_results['games_played'] += 1
         if elo_result == 0.5:
@@ -227,6 +820,9 @@ class Orchestrator:
 
         self.records[a]['games_lost'] += match_results['a_games_lost']
         self.records[b]['games_lost'] += match_results['b_games_lost']
+
+        self.merge_timing(self.records[a]['timing'], match_results['a_timing'])
+        self.merge_timing(self.records[b]['timing'], match_results['b_timing'])
         
         if a_games_won == b_games_won:
             self.records[a]['matches_drawn'] += 1
@@ -258,6 +854,16 @@ class Orchestrator:
         self.pairwise_records[pair_key][player_b.bot_name]['games_lost'] += match_results['b_games_lost']
         self.pairwise_records[pair_key][player_b.bot_name]['games_drawn'] += match_results['games_drawn']
 
+        if match_results['a_games_won'] == match_results['b_games_won']:
+            self.pairwise_records[pair_key][player_a.bot_name]['matches_drawn'] += 1
+            self.pairwise_records[pair_key][player_b.bot_name]['matches_drawn'] += 1
+        elif match_results['a_games_won'] > match_results['b_games_won']:
+            self.pairwise_records[pair_key][player_a.bot_name]['matches_won'] += 1
+            self.pairwise_records[pair_key][player_b.bot_name]['matches_lost'] += 1
+        else:
+            self.pairwise_records[pair_key][player_a.bot_name]['matches_lost'] += 1
+            self.pairwise_records[pair_key][player_b.bot_name]['matches_won'] += 1
+
     def record_match(self, player, opponent, result):
         """Updates ELO of player and opponent
         result is 0 for a loss; 0.5 for a draw; 1 for a win
@@ -293,6 +899,28 @@ class Orchestrator:
     def compare_rating(self, player, opponent):
         return ( 1+10**((opponent-player)/400.0)) ** -1
 
+    def update_ratings(self):
+        """Fits Bradley-Terry ratings to the win, draw and loss counts of every pair played so far.
+        Overall ratings come from one fit over all pairs and get a 95% interval; pairwise ratings from
+        a fit of each pair alone. Unlike online Elo the result does not depend on the order of the games.
+        Does nothing with online Elo, whose ratings are updated after every game.
+        """
+        if self.rating_method != "bradley_terry":
+            return
+        bot_names = list(self.records)
+        wins = pair_wins(bot_names, self.pairwise_records)
+        # the current ratings are the starting point, so refitting after a few more games is cheap
+        ratings, stderrs = fit_bradley_terry(wins, [self.records[bot_name]['elo'] - self.STARTING_ELO for bot_name in bot_names])
+        for bot_name, rating, stderr in zip(bot_names, ratings, stderrs):
+            rating = self.STARTING_ELO + float(rating)
+            self.records[bot_name]['elo'] = rating
+            self.records[bot_name]['elo_interval'] = (rating - self.RATING_Z * float(stderr), rating + self.RATING_Z * float(stderr))
+        index = {bot_name: i for i, bot_name in enumerate(bot_names)}
+        pair_ratings = pairwise_ratings(wins)
+        for pair, records in self.pairwise_records.items():
+            records[pair[0]]['pairwise_elo'] = self.STARTING_ELO + float(pair_ratings[index[pair[0]], index[pair[1]]])
+            records[pair[1]]['pairwise_elo'] = self.STARTING_ELO + float(pair_ratings[index[pair[1]], index[pair[0]]])
+
     def pretty_print(self, d, indent=0):
         for key, value in d.items():
             print('\t' * indent + str(key))
@@ -301,7 +929,29 @@ class Orchestrator:
             else:
                 print('\t' * (indent+1) + str(value))
 
-    def visualize_results(self):
+    def report_results(self):
+        """Prints the records and the profile, if any, then the Elo table and heatmap unless `visualize` is False."""
+        self.update_ratings()
+        self.pretty_print(self.records)
+        if self.profiler is not None:
+            print(self.profiler.report())
+            if self.profile_path is not None:
+                self.profiler.save(self.profile_path)
+        if self.visualize:
+            self.visualize_results(self.heatmap_path)
+
+    def visualize_results(self, heatmap_path=None):
+        """Prints the Elo table and draws it as a heatmap.
+        The heatmap is written to `heatmap_path` if given, otherwise shown in a window.
+        Plotting libraries are imported here so that headless runs never pay for them.
+        """
+        import pandas as pd
+        import seaborn as sns
+        import matplotlib
+        if heatmap_path is not None:
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
         bot_names = [player.bot_name for player in self.player_pool]
         pd.options.display.float_format = '{:.0f}'.format
 
@@ -326,4 +976,8 @@ class Orchestrator:
         ax.tick_params(top=True, bottom=False, labeltop=True, labelbottom=False)
         ax.xaxis.set_label_position('top')
         plt.xticks(rotation=45)
-        plt.show()
+        if heatmap_path is not None:
+            plt.savefig(heatmap_path, bbox_inches="tight")
+            plt.close()
+        else:
+            plt.show()
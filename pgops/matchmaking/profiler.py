@@ -0,0 +1,119 @@
+import csv
+import math
+import time
+
+class Profiler:
+    """Call counts and wall-clock time per (owner, method), where owner is a bot name or "engine".
+    Times are kept in log-spaced histogram buckets rather than as raw samples, so memory stays constant
+    over long tournaments and profiles from worker processes can be merged.
+    Percentiles are reported as the upper bound of their bucket, within about 19% of the true value.
+    """
+    MIN_TIME = 1e-7
+    BUCKETS_PER_OCTAVE = 4
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, owner, method, elapsed):
+        key = (owner, method)
+        stat = self.stats.get(key)
+        if stat is None:
+            stat = {"calls": 0, "total_time": 0.0, "max_time": 0.0, "buckets": {}}
+            self.stats[key] = stat
+        stat['calls'] += 1
+        stat['total_time'] += elapsed
+        if elapsed > stat['max_time']:
+            stat['max_time'] = elapsed
+        bucket = self.bucket_of(elapsed)
+        stat['buckets'][bucket] = stat['buckets'].get(bucket, 0) + 1
+
+    def bucket_of(self, elapsed):
+        if elapsed <= self.MIN_TIME:
+            return 0
+        return int(math.log2(elapsed / self.MIN_TIME) * self.BUCKETS_PER_OCTAVE)
+
+    def bucket_upper_bound(self, bucket):
+        return self.MIN_TIME * 2 ** ((bucket + 1) / self.BUCKETS_PER_OCTAVE)
+
+    def instrument(self, obj, owner, method_names):
+        """Replaces methods of `obj` with timed wrappers. Only this instance is affected,
+        so nothing is wrapped, and nothing costs extra, unless profiling is on.
+        """
+        for method_name in method_names:
+            setattr(obj, method_name, self.timed(owner, method_name, getattr(obj, method_name)))
+
+    def timed(self, owner, method_name, method):
+        def timed_method(*args):
+            start = time.perf_counter()
+            result = method(*args)
+            self.record(owner, method_name, time.perf_counter() - start)
+            return result
+        return timed_method
+
+    def merge(self, other):
+        for key, other_stat in other.stats.items():
+            stat = self.stats.get(key)
+            if stat is None:
+                stat = {"calls": 0, "total_time": 0.0, "max_time": 0.0, "buckets": {}}
+                self.stats[key] = stat
+            stat['calls'] += other_stat['calls']
+            stat['total_time'] += other_stat['total_time']
+            stat['max_time'] = max(stat['max_time'], other_stat['max_time'])
+            for bucket, count in other_stat['buckets'].items():
+                stat['buckets'][bucket] = stat['buckets'].get(bucket, 0) + count
+
+    def histogram(self, owner, method):
+        """Returns (upper bound in seconds, count) for every non-empty bucket, fastest first."""
+        buckets = self.stats[(owner, method)]['buckets']
+        return [(self.bucket_upper_bound(bucket), buckets[bucket]) for bucket in sorted(buckets)]
+
+    def percentile(self, stat, percent):
+        threshold = stat['calls'] * percent / 100
+        seen = 0
+        for bucket in sorted(stat['buckets']):
+            seen += stat['buckets'][bucket]
+            if seen >= threshold:
+                return min(self.bucket_upper_bound(bucket), stat['max_time'])
+        return stat['max_time']
+
+    def summary_rows(self):
+        """One dict per (owner, method), with the most total time first."""
+        rows = []
+        for (owner, method), stat in self.stats.items():
+            row = {
+                "owner": owner,
+                "method": method,
+                "calls": stat['calls'],
+                "total_time": stat['total_time'],
+                "mean_time": stat['total_time'] / stat['calls']
+            }
+            for percent in self.PERCENTILES:
+                row[f'p{percent}_time'] = self.percentile(stat, percent)
+            row['max_time'] = stat['max_time']
+            rows.append(row)
+        return sorted(rows, key=lambda row: row['total_time'], reverse=True)
+
+    def report(self):
+        """Summary table as text; times in milliseconds, except the total in seconds."""
+        header = f'{"owner":<24} {"method":<24} {"calls":>10} {"total s":>10} {"mean ms":>9}'
+        for percent in self.PERCENTILES:
+            header += f' {f"p{percent} ms":>9}'
+        header += f' {"max ms":>9}'
+        lines = [header]
+        for row in self.summary_rows():
+            line = f'{row["owner"]:<24} {row["method"]:<24} {row["calls"]:>10} {row["total_time"]:>10.3f} {row["mean_time"] * 1000:>9.4f}'
+            for percent in self.PERCENTILES:
+                line += f' {row[f"p{percent}_time"] * 1000:>9.4f}'
+            line += f' {row["max_time"] * 1000:>9.4f}'
+            lines.append(line)
+        return "\n".join(lines)
+
+    def save(self, path):
+        """Writes the summary table to `path` as CSV, times in seconds."""
+        rows = self.summary_rows()
+        fieldnames = ["owner", "method", "calls", "total_time", "mean_time"] + [f'p{percent}_time' for percent in self.PERCENTILES] + ["max_time"]
+        with open(path, "w", newline="") as profile_file:
+            writer = csv.DictWriter(profile_file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
\ No newline at end of file
@@ -0,0 +1,72 @@
+import math
+
+# converts natural-log strengths to the Elo scale
+ELO_SCALE = 400 / math.log(10)
+
+def pair_wins(names, pairwise_records, prior_draws=1.0):
+    """Builds W where W[i][j] counts the games bot i won against bot j, with draws as half a win each.
+    Every pair that played also gets `prior_draws` virtual draws, which keeps the ratings of bots
+    that never won (or never lost) a game finite.
+    """
+    import numpy as np
+
+    index = {name: i for i, name in enumerate(names)}
+    wins = np.zeros((len(names), len(names)))
+    for pair, records in pairwise_records.items():
+        i = index[pair[0]]
+        j = index[pair[1]]
+        first = records[pair[0]]
+        second = records[pair[1]]
+        if first['games_played'] == 0:
+            continue
+        draws = first['games_drawn'] + prior_draws
+        wins[i, j] += first['games_won'] + draws / 2
+        wins[j, i] += second['games_won'] + draws / 2
+    return wins
+
+def fit_bradley_terry(wins, initial=None, max_iterations=10000, tolerance=1e-10):
+    """Fits Bradley-Terry strengths to the win matrix `wins` with Hunter's MM algorithm.
+    `initial` optionally holds earlier ratings on the Elo scale to start from; after a few new games,
+    a fit started from the previous ratings converges in a handful of iterations.
+    Returns (ratings, stderrs) as arrays on the Elo scale, with ratings centered on 0.
+    Standard errors come from the inverse Fisher information of the log-likelihood.
+    Bots that played no games get a rating of 0 and an infinite standard error.
+    """
+    import numpy as np
+
+    games = wins + wins.T
+    total_wins = wins.sum(axis=1)
+    played = games.sum(axis=1) > 0
+    strengths = np.ones(len(wins)) if initial is None else np.exp(np.asarray(initial, dtype=float) / ELO_SCALE)
+    for iteration in range(max_iterations):
+        pair_sums = strengths[:, None] + strengths[None, :]
+        denominators = (games / pair_sums).sum(axis=1)
+        updated = np.where(played, total_wins / np.where(played, denominators, 1), 1.0)
+        # fix the scale: geometric mean of the bots that played is 1
+        updated /= np.exp(np.log(updated[played]).mean()) if played.any() else 1
+        change = np.abs(np.log(updated) - np.log(strengths)).max()
+        strengths = updated
+        if change < tolerance:
+            break
+
+    log_strengths = np.log(strengths)
+    pair_sums = strengths[:, None] + strengths[None, :]
+    information = -games * strengths[:, None] * strengths[None, :] / pair_sums ** 2
+    np.fill_diagonal(information, 0)
+    np.fill_diagonal(information, -information.sum(axis=1))
+    # the likelihood only sees differences, so the pseudo-inverse picks the zero-mean gauge
+    covariance = np.linalg.pinv(information)
+    stderrs = np.sqrt(np.clip(np.diag(covariance), 0, None))
+    stderrs = np.where(played, stderrs, np.inf)
+    log_strengths = np.where(played, log_strengths - log_strengths[played].mean() if played.any() else 0, 0)
+    return log_strengths * ELO_SCALE, stderrs * ELO_SCALE
+
+def pairwise_ratings(wins):
+    """Fits every pair on its own: R[i][j] is bot i's rating against bot j alone, on the Elo scale around 0.
+    A two-bot Bradley-Terry fit has a closed form, so all pairs are solved at once.
+    """
+    import numpy as np
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratings = (np.log(wins) - np.log(wins.T)) * ELO_SCALE / 2
+    return np.where((wins > 0) & (wins.T > 0), ratings, 0.0)
\ No newline at end of file
@@ -5,28 +5,53 @@ from .card import Card
 from .card_state import CardState
 
 class Pgops:
-    def __init__(self, game_type, logging=False):
+    # (value, suit, name) of each deck card, built once per game type and shared by every game
+    DECK_LAYOUTS = {}
+
+    def __init__(self, game_type, logging=False, rng=None):
+        """`rng` is a `random.Random` used to deal the deck. Defaults to the global generator."""
         self.game_type = game_type
         self.logging = logging
+        self.rng = rng
+        self.deck = None
 
-    def new_game(self):
-        self.player_a = Player(1, self.game_type)
-        self.player_b = Player(2, self.game_type)
-        self.players = {"player_a":self.player_a, "player_b":self.player_b}
-        self.deck = self.setup_gops_deck(self.game_type)
+    def new_game(self, deck_order=None):
+        """`deck_order` optionally fixes the order targets are drawn in, as indexes into the deck's cards.
+        Otherwise the deck is shuffled once here.
+        Cards are created for the first game only; later games reset them in place.
+        """
+        if self.deck is None:
+            self.player_a = Player(1, self.game_type)
+            self.player_b = Player(2, self.game_type)
+            self.players = {"player_a":self.player_a, "player_b":self.player_b}
+            self.deck = self.setup_gops_deck(self.game_type)
+        else:
+            self.player_a.reset()
+            self.player_b.reset()
+            self.deck.reset()
+        if deck_order is None:
+            self.deck.shuffle()
+        else:
+            self.deck.set_draw_order(deck_order)
+        self.cached_state = None
+        self.cached_state_version = None
+        # maintained by `next_turn` and `evaluate_played_cards` as targets are drawn and won
+        self.a_score = 0
+        self.b_score = 0
+        self.pot = 0
 
     def setup_gops_deck(self, game_type):
-        cards = []
-        for i in range(1, 14):
-            card_a = Card(i, "positive", CardState.in_deck)
-            cards.append(card_a)
-            if game_type == "bgops" or game_type == "bgops_minus":
-                card_b = Card(i, "positive", CardState.in_deck)
-                cards.append(card_b)
-                if game_type == "bgops_minus":
-                    card_c = Card(-i, "negative", CardState.in_deck)
-                    cards.append(card_c)
-        deck = Deck(cards, "deck")
+        if game_type not in self.DECK_LAYOUTS:
+            layout = []
+            for i in range(1, 14):
+                layout.append((i, "positive", str(i)))
+                if game_type == "bgops" or game_type == "bgops_minus":
+                    layout.append((i, "positive", str(i)))
+                    if game_type == "bgops_minus":
+                        layout.append((-i, "negative", str(-i)))
+            self.DECK_LAYOUTS[game_type] = tuple(layout)
+        cards = [Card(value, suit, CardState.in_deck, name) for value, suit, name in self.DECK_LAYOUTS[game_type]]
+        deck = Deck(cards, "deck", rng=self.rng)
         if self.logging:
             print(f'created deck of length {len(cards)}')
         return deck
@@ -42,30 +67,17 @@ class Pgops:
             self.player_b.unfreeze_next = True
         if self.player_a.frozen or self.player_b.frozen:
             return
-        bidding_card = self.deck.random_card_for_bidding()
+        bidding_card = self.deck.draw_card_for_bidding()
+        self.pot += bidding_card.value
         return bidding_card
         if self.logging:
             print(f'bidding target is {bidding_card.value}')
 
     def evaluate_played_cards(self):
         turn_result = []
-        a_sealed_bid_list = [card for card in self.player_a.hand.cards if card.state == CardState.player_a_sealed_bid]
-        b_sealed_bid_list = [card for card in self.player_b.hand.cards if card.state == CardState.player_b_sealed_bid]
-
-        if len(a_sealed_bid_list) > 0:
-            a_sealed_bid = a_sealed_bid_list[0]
-        else:
-            a_sealed_bid = None
-        if len(b_sealed_bid_list) > 0:
-            b_sealed_bid = b_sealed_bid_list[0]
-        else:
-            b_sealed_bid = None
-
-        a_playzone = [card for card in self.player_a.hand.cards if card.state == CardState.player_a_playzone]
-        b_playzone = [card for card in self.player_b.hand.cards if card.state == CardState.player_b_playzone]
-
-        previous_bid_targets = [card for card in self.deck.cards if card.state == CardState.previous_bid_targets]
-        current_bid_target = [card for card in self.deck.cards if card.state == CardState.current_bid_target][0]
+        a_sealed_bid = self.player_a.hand.first_card_in_state(CardState.player_a_sealed_bid)
+        b_sealed_bid = self.player_b.hand.first_card_in_state(CardState.player_b_sealed_bid)
+        current_bid_target = self.deck.first_card_in_state(CardState.current_bid_target)
         
         either_spied = False
         if a_sealed_bid is not None and a_sealed_bid.name == "Spy":
@@ -98,12 +110,10 @@ class Pgops:
             current_bid_target.change_state(CardState.global_discard)
             a_sealed_bid.change_state(CardState.player_a_discard)
             b_sealed_bid.change_state(CardState.player_b_discard)
-            for bombed_card in previous_bid_targets:
-                bombed_card.change_state(CardState.global_discard)
-            for bombed_card in a_playzone:
-                bombed_card.change_state(CardState.player_a_discard)
-            for bombed_card in b_playzone:
-                bombed_card.change_state(CardState.player_b_discard)
+            discarded = self.deck.move_cards_in_state(CardState.previous_bid_targets, CardState.global_discard)
+            self.pot -= current_bid_target.value + sum(card.value for card in discarded)
+            self.player_a.hand.move_cards_in_state(CardState.player_a_playzone, CardState.player_a_discard)
+            self.player_b.hand.move_cards_in_state(CardState.player_b_playzone, CardState.player_b_discard)
             return turn_result
 
         # tie; push
@@ -122,8 +132,10 @@ class Pgops:
             if self.logging:
                 print(f'player_a won bid\n')
             current_bid_target.change_state(CardState.player_a_score)
-            for won_card in previous_bid_targets:
-                won_card.change_state(CardState.player_a_score)
+            won = self.deck.move_cards_in_state(CardState.previous_bid_targets, CardState.player_a_score)
+            won_value = current_bid_target.value + sum(card.value for card in won)
+            self.a_score += won_value
+            self.pot -= won_value
         
         # player_b wins; all bid targets move to player_b_score
         elif a_sealed_bid is None or b_sealed_bid.value > a_sealed_bid.value:
@@ -131,18 +143,18 @@ class Pgops:
             if self.logging:
                 print(f'player_b won bid\n')
             current_bid_target.change_state(CardState.player_b_score)
-            for won_card in previous_bid_targets:
-                won_card.change_state(CardState.player_b_score)
+            won = self.deck.move_cards_in_state(CardState.previous_bid_targets, CardState.player_b_score)
+            won_value = current_bid_target.value + sum(card.value for card in won)
+            self.b_score += won_value
+            self.pot -= won_value
     
         # all playzone cards are discarded
         if a_sealed_bid is not None:
             a_sealed_bid.change_state(CardState.player_a_discard)
         if b_sealed_bid is not None:
             b_sealed_bid.change_state(CardState.player_b_discard)
-        for discard_card in a_playzone:
-            discard_card.change_state(CardState.player_a_discard)
-        for discard_card in b_playzone:
-            discard_card.change_state(CardState.player_b_discard)
+        self.player_a.hand.move_cards_in_state(CardState.player_a_playzone, CardState.player_a_discard)
+        self.player_b.hand.move_cards_in_state(CardState.player_b_playzone, CardState.player_b_discard)
         return turn_result
 
     def is_game_over(self):
@@ -155,11 +167,24 @@ class Pgops:
         return False
 
     def score_players(self):
-        player_a_score = sum([card.value for card in self.deck.cards if card.state == CardState.player_a_score])
-        player_b_score = sum([card.value for card in self.deck.cards if card.state == CardState.player_b_score])
-        return (player_a_score, player_b_score)
+        """Running scores, kept up to date as targets are won."""
+        return (self.a_score, self.b_score)
+
+    def pot_value(self):
+        """Total value of the active bid targets, including pushed targets."""
+        return self.pot
+
+    def state_version(self):
+        """Changes whenever any card changes state or a hand is revealed or hidden."""
+        return self.player_a.hand.version + self.player_b.hand.version + self.deck.version
 
     def masked_game_state(self):
+        """Built lazily and memoized until the next state transition.
+        The returned dict is shared between callers and must not be modified.
+        """
+        version = self.state_version()
+        if self.cached_state is not None and self.cached_state_version == version:
+            return self.cached_state
         a_hand = self.player_a.hand.masked_pile_state()
         b_hand = self.player_b.hand.masked_pile_state()
         deck_state = self.deck.pile_state()
@@ -171,4 +196,6 @@ class Pgops:
             "player_a_score":current_score[0],
             "player_b_score":current_score[1]
         }
+        self.cached_state = state
+        self.cached_state_version = version
         return state
\ No newline at end of file
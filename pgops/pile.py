@@ -1,13 +1,85 @@
-import random
-
 from .card_state import CardState
 
 class Pile:
+    __slots__ = ("cards", "designation", "starting_size", "starting_states", "revealing", "version", "state_masks")
+
     def __init__(self, cards, designation):
         self.cards = cards
         self.designation = designation
         self.starting_size = len(self.cards)
+        self.starting_states = [card.state for card in self.cards]
         self.revealing = False
+        # bumped on every state transition so that derived views can be cached
+        self.version = 0
+        self.reindex()
+
+    def reindex(self):
+        """Rebuilds the per-state bitmasks. Must be called if `self.cards` is reordered."""
+        self.version += 1
+        # one bitmask per CardState, bit n set means self.cards[n] is in that state
+        self.state_masks = [0] * len(CardState)
+        for card_id, card in enumerate(self.cards):
+            card.attach(self, card_id)
+            self.state_masks[card.state.value] |= 1 << card_id
+
+    def reset(self):
+        """Returns every card to the state it started in, reusing the card objects."""
+        for card, state in zip(self.cards, self.starting_states):
+            card.state = state
+        self.revealing = False
+        self.reindex()
+
+    def set_revealing(self, revealing):
+        if revealing != self.revealing:
+            self.version += 1
+        self.revealing = revealing
+
+    def track_state_change(self, card, new_state):
+        """Called by `Card.change_state` before the card's state is overwritten."""
+        self.version += 1
+        bit = 1 << card.card_id
+        self.state_masks[card.state.value] &= ~bit
+        self.state_masks[new_state.value] |= bit
+
+    def count_cards_in_state(self, state):
+        return bin(self.state_masks[state.value]).count("1")
+
+    def cards_in_state(self, state):
+        return self.cards_in_mask(self.state_masks[state.value])
+
+    def cards_in_states(self, *states):
+        """Returns cards in any of `states`, in pile order."""
+        mask = 0
+        for state in states:
+            mask |= self.state_masks[state.value]
+        return self.cards_in_mask(mask)
+
+    def cards_in_mask(self, mask):
+        cards = []
+        while mask:
+            low_bit = mask & -mask
+            cards.append(self.cards[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return cards
+
+    def is_card_in_state(self, card, state):
+        return card.pile is self and self.state_masks[state.value] >> card.card_id & 1 == 1
+
+    def first_card_in_state(self, state):
+        mask = self.state_masks[state.value]
+        if not mask:
+            return None
+        return self.cards[(mask & -mask).bit_length() - 1]
+
+    def move_cards_in_state(self, old_state, new_state):
+        """Moves every card in `old_state` to `new_state` in one transition."""
+        self.version += 1
+        moved = self.cards_in_state(old_state)
+        for card in moved:
+            card.state = new_state
+        self.state_masks[new_state.value] |= self.state_masks[old_state.value]
+        self.state_masks[old_state.value] = 0
+        return moved
 
     def score_of_pile(self):
         score = 0
@@ -1,8 +1,11 @@
 from .card import Card
-from .card_state import CardState
+from .card_state import CardState, HAND_STATES
 from .hand import Hand
 
 class Player:
+    # (value, suit, name) of each hand card, built once per hand type and shared by every game
+    HAND_LAYOUTS = {}
+
     def __init__(self, player_id, game_type):
         self.player_id = player_id
         self.hand = self.make_new_hand(game_type,1,13)
@@ -10,24 +13,32 @@ class Player:
         self.unfreeze_next = False
 
     def make_new_hand(self, game_type, min_value, max_value):
-        cards = []
-        for i in range(min_value, max_value+1):
-            card = Card(i, "player", CardState(self.player_id), str(i))
-            cards.append(card)
-        if game_type == "bgops" or game_type == "bgops_minus":
-            spy = Card(0, "player", CardState(self.player_id), "Spy")
-            bomb = Card(-1, "player", CardState(self.player_id), "Bomb")
-            cards.append(spy)
-            cards.append(bomb)
+        layout_key = (game_type, min_value, max_value)
+        if layout_key not in self.HAND_LAYOUTS:
+            layout = []
+            for i in range(min_value, max_value+1):
+                layout.append((i, "player", str(i)))
+            if game_type == "bgops" or game_type == "bgops_minus":
+                layout.append((0, "player", "Spy"))
+                layout.append((-1, "player", "Bomb"))
+            self.HAND_LAYOUTS[layout_key] = tuple(layout)
+        hand_state = HAND_STATES[self.player_id]
+        cards = [Card(value, suit, hand_state, name) for value, suit, name in self.HAND_LAYOUTS[layout_key]]
         hand = Hand(cards, self.player_id)
         return hand
 
+    def reset(self):
+        """Prepares the player for a new game, keeping the same card objects."""
+        self.hand.reset()
+        self.frozen = False
+        self.unfreeze_next = False
+
     def play_specific_card(self, chosen_card):
         if self.frozen:
             return None
-        if chosen_card.state.value != self.player_id:
+        if chosen_card.state is not self.hand.hand_state:
             raise Exception(f"Card {chosen_card.name} not playable")
-        chosen_card.change_state(CardState(chosen_card.state.value + 2))
+        chosen_card.change_state(self.hand.sealed_bid_state)
         return chosen_card
 
     def mask(self):
@@ -35,10 +46,10 @@ class Player:
         return hand_mask
 
     def reveal_hand(self):
-        self.hand.revealing = True
+        self.hand.set_revealing(True)
 
     def hide_hand(self):
-        self.hand.revealing = False
+        self.hand.set_revealing(False)
     
     def freeze_self(self):
         self.frozen = True
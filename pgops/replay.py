@@ -0,0 +1,111 @@
+import argparse
+import time
+
+from .pgops import Pgops
+from .matchmaking.game_log import GameLogReader, read_game_logs
+
+class ReplayResult:
+    __slots__ = ("logged", "a_score", "b_score", "elo_result", "mismatches")
+
+    def __init__(self, logged, a_score, b_score, elo_result, mismatches):
+        """`mismatches` lists every way the replay differed from the log; empty if it matched."""
+        self.logged = logged
+        self.a_score = a_score
+        self.b_score = b_score
+        self.elo_result = elo_result
+        self.mismatches = mismatches
+
+class Replayer:
+    """Replays logged games through the game rules without bots.
+    The recorded targets fix the deck order and the recorded bids are played as-is, so any difference
+    between the replayed and logged results points at a rule change or an engine bug.
+    `game_class` may be a `Pgops` subclass with modified rules, for what-if replays of real games.
+    One game object is kept per game type and reset between games.
+    """
+    def __init__(self, game_class=Pgops, check_turns=True):
+        self.game_class = game_class
+        # turn by turn results and scores are compared only if set; final scores are always compared
+        self.check_turns = check_turns
+        self.games = {}
+
+    def replay(self, logged):
+        """Replays one `LoggedGame` and returns a `ReplayResult`."""
+        game = self.games.get(logged.game_type)
+        if game is None:
+            game = self.game_class(logged.game_type)
+            self.games[logged.game_type] = game
+        game.new_game(deck_order=logged.deck_order())
+        mismatches = []
+        for turn_number, turn in enumerate(logged.turns):
+            bid_card = game.next_turn()
+            target = bid_card.card_id if bid_card is not None else None
+            if target != turn.target:
+                mismatches.append(f'turn {turn_number}: drew target {target}, logged {turn.target}')
+                break
+            try:
+                if turn.a_bid is not None:
+                    game.player_a.play_specific_card(game.player_a.hand.cards[turn.a_bid])
+                if turn.b_bid is not None:
+                    game.player_b.play_specific_card(game.player_b.hand.cards[turn.b_bid])
+                result = game.evaluate_played_cards()
+            except Exception as e:
+                mismatches.append(f'turn {turn_number}: {e}')
+                break
+            if self.check_turns:
+                if set(result) != set(turn.result):
+                    mismatches.append(f'turn {turn_number}: result {result}, logged {turn.result}')
+                score = game.score_players()
+                if score != (turn.a_score, turn.b_score):
+                    mismatches.append(f'turn {turn_number}: scores {score}, logged {(turn.a_score, turn.b_score)}')
+        score = game.score_players()
+        # a forfeited game is lost by the bot that forfeited it, whatever the score
+        if logged.a_forfeited != logged.b_forfeited:
+            elo_result = 0 if logged.a_forfeited else 1
+        elif logged.a_forfeited or score[0] == score[1]:
+            elo_result = 0.5
+        elif score[0] > score[1]:
+            elo_result = 1
+        else:
+            elo_result = 0
+        if logged.elo_result is None:
+            mismatches.append('game has no end record')
+        else:
+            if score != (logged.a_score, logged.b_score):
+                mismatches.append(f'final scores {score}, logged {(logged.a_score, logged.b_score)}')
+            if elo_result != logged.elo_result:
+                mismatches.append(f'result {elo_result}, logged {logged.elo_result}')
+            if not logged.forfeited() and not game.is_game_over():
+                mismatches.append('game is not over after the logged turns')
+        return ReplayResult(logged, score[0], score[1], elo_result, mismatches)
+
+    def replay_games(self, logged_games):
+        """Lazily replays an iterable of `LoggedGame`s, yielding a `ReplayResult` per game."""
+        for logged in logged_games:
+            yield self.replay(logged)
+
+    def replay_file(self, path):
+        return self.replay_games(GameLogReader(path))
+
+def get_args():
+    parser = argparse.ArgumentParser(description='Replay logged games without bots and check them against the log')
+    parser.add_argument('paths', nargs='+', help='Game log files or shards')
+    parser.add_argument('--final-only', action='store_true',
+                        help='Only check final scores and results, not every turn')
+    parser.add_argument('--show', type=int, default=10,
+                        help='Number of mismatched games to print')
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = get_args()
+    replayer = Replayer(check_turns=not args.final_only)
+    games = 0
+    mismatched = 0
+    start = time.perf_counter()
+    for result in replayer.replay_games(read_game_logs(args.paths)):
+        games += 1
+        if result.mismatches:
+            mismatched += 1
+            if mismatched <= args.show:
+                print(f'match {result.logged.match_seed} game {result.logged.game_index} ({result.logged.a_name} vs {result.logged.b_name}): {"; ".join(result.mismatches)}')
+    elapsed = time.perf_counter() - start
+    print(f'replayed {games} games in {elapsed:.2f}s ({games / elapsed if elapsed > 0 else 0:.0f} games/s); {mismatched} mismatched')
\ No newline at end of file
@@ -0,0 +1,76 @@
+SPY = 0
+BOMB = -1
+
+class RolloutGame:
+    """Minimal game state for fast playouts of gops, bgops and bgops_minus.
+
+    Seats 0 and 1 hold lists of card values, with the Spy as 0 and the Bomb as -1.
+    `deck` lists the targets still to be drawn; the next one is popped from the end.
+    `pot` lists the values of all active bid targets and `scores` each seat's score.
+    `frozen` is the seat that was spied on last turn, if any; its sealed bid `locked_bid` is
+    played again this turn and no new target is drawn.
+    All active targets are resolved together, as the rules describe.
+    """
+    __slots__ = ("hands", "deck", "pot", "scores", "frozen", "locked_bid")
+
+    def __init__(self, hands, deck, pot, scores, frozen=None, locked_bid=None):
+        self.hands = [list(hands[0]), list(hands[1])]
+        self.deck = list(deck)
+        self.pot = list(pot)
+        self.scores = list(scores)
+        self.frozen = frozen
+        self.locked_bid = locked_bid
+
+    def can_bid(self, seat):
+        return self.frozen != seat and len(self.hands[seat]) > 0
+
+    def is_over(self):
+        return not self.hands[0] and not self.hands[1]
+
+    def start_turn(self):
+        """Draws the next target unless a seat is frozen. Returns False if the deck ran out."""
+        if self.frozen is None:
+            if not self.deck:
+                return False
+            self.pot.append(self.deck.pop())
+        return True
+
+    def resolve(self, a_bid, b_bid):
+        """Plays one bid per seat; None for a frozen or empty hand. Played cards leave the hands."""
+        if a_bid is not None:
+            self.hands[0].remove(a_bid)
+        if b_bid is not None:
+            self.hands[1].remove(b_bid)
+        if self.frozen == 0:
+            a_bid = self.locked_bid
+        elif self.frozen == 1:
+            b_bid = self.locked_bid
+        self.frozen = None
+
+        if a_bid == SPY or b_bid == SPY:
+            # two spies cancel out and the seats bid again
+            if a_bid != b_bid:
+                self.frozen = 1 if a_bid == SPY else 0
+                self.locked_bid = b_bid if a_bid == SPY else a_bid
+            return
+        if a_bid == BOMB or b_bid == BOMB:
+            self.pot = []
+            return
+        # tie; push
+        if a_bid == b_bid:
+            return
+        if b_bid is None or a_bid is not None and a_bid > b_bid:
+            self.scores[0] += sum(self.pot)
+        else:
+            self.scores[1] += sum(self.pot)
+        self.pot = []
+
+    def play_out(self, choose_bid):
+        """Plays to the end of the game, calling `choose_bid(game, seat)` for every bid.
+        Returns seat 0's score minus seat 1's.
+        """
+        while not self.is_over() and self.start_turn():
+            a_bid = choose_bid(self, 0) if self.can_bid(0) else None
+            b_bid = choose_bid(self, 1) if self.can_bid(1) else None
+            self.resolve(a_bid, b_bid)
+        return self.scores[0] - self.scores[1]
\ No newline at end of file
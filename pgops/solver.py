@@ -0,0 +1,202 @@
+EPSILON = 1e-12
+
+def mask_of_values(values):
+    """Bitmask with bit `v - 1` set for every card value `v`."""
+    mask = 0
+    for value in values:
+        mask |= 1 << (value - 1)
+    return mask
+
+def values_of_mask(mask):
+    """Card values in `mask`, lowest first."""
+    values = []
+    while mask:
+        low_bit = mask & -mask
+        values.append(low_bit.bit_length())
+        mask ^= low_bit
+    return values
+
+def sign(value):
+    if value > 0:
+        return 1
+    if value < 0:
+        return -1
+    return 0
+
+def canonical_hands(my_hand, opponent_hand):
+    """Relabels both hands by rank within their union.
+    Hand cards are only ever compared against each other, so positions that differ only in
+    the gaps between hand values have the same value and share a transposition table entry.
+    """
+    union = values_of_mask(my_hand | opponent_hand)
+    my_canonical = 0
+    opponent_canonical = 0
+    for rank, value in enumerate(union):
+        bit = 1 << (value - 1)
+        if my_hand & bit:
+            my_canonical |= 1 << rank
+        if opponent_hand & bit:
+            opponent_canonical |= 1 << rank
+    return my_canonical, opponent_canonical
+
+def transposition_key(kind, my_hand, opponent_hand, deck, pot, diff):
+    """Returns (key, flipped). Swapping the players negates the value, so both orientations
+    share one key; `flipped` is True if the key describes the position from the opponent's side.
+    """
+    my_canonical, opponent_canonical = canonical_hands(my_hand, opponent_hand)
+    if (opponent_canonical, -diff) < (my_canonical, diff):
+        return (kind, opponent_canonical, my_canonical, deck, pot, -diff), True
+    return (kind, my_canonical, opponent_canonical, deck, pot, diff), False
+
+def solve_matrix_game(payoffs):
+    """Solves the zero-sum matrix game where the row player maximizes `payoffs[i][j]`.
+    Returns (value, row_strategy). Uses the simplex pivot method, after checking for a saddle point.
+    """
+    rows = len(payoffs)
+    cols = len(payoffs[0])
+    row_mins = [min(row) for row in payoffs]
+    col_maxes = [max(payoffs[i][j] for i in range(rows)) for j in range(cols)]
+    lower = max(row_mins)
+    if lower >= min(col_maxes) - EPSILON:
+        strategy = [0.0] * rows
+        strategy[row_mins.index(lower)] = 1.0
+        return lower, strategy
+
+    # shift every payoff to at least 1 so the game value is positive
+    shift = 1 - min(row_mins)
+    tableau = [[payoffs[i][j] + shift for j in range(cols)] + [1.0] for i in range(rows)]
+    tableau.append([-1.0] * cols + [0.0])
+    left_labels = [("x", i) for i in range(rows)]
+    top_labels = [("y", j) for j in range(cols)]
+    while True:
+        bottom = tableau[rows]
+        pivot_col = None
+        for j in range(cols):
+            if bottom[j] < -EPSILON:
+                pivot_col = j
+                break
+        if pivot_col is None:
+            break
+        pivot_row = None
+        best_ratio = float("inf")
+        for i in range(rows):
+            entry = tableau[i][pivot_col]
+            if entry > EPSILON and tableau[i][cols] / entry < best_ratio:
+                best_ratio = tableau[i][cols] / entry
+                pivot_row = i
+        pivot = tableau[pivot_row][pivot_col]
+        for i in range(rows + 1):
+            if i == pivot_row:
+                continue
+            factor = tableau[i][pivot_col] / pivot
+            if factor == 0:
+                continue
+            row = tableau[i]
+            pivot_values = tableau[pivot_row]
+            for j in range(cols + 1):
+                if j != pivot_col:
+                    row[j] -= factor * pivot_values[j]
+            row[pivot_col] = -factor
+        pivot_values = tableau[pivot_row]
+        for j in range(cols + 1):
+            if j != pivot_col:
+                pivot_values[j] /= pivot
+        pivot_values[pivot_col] = 1 / pivot
+        left_labels[pivot_row], top_labels[pivot_col] = top_labels[pivot_col], left_labels[pivot_row]
+
+    corner = tableau[rows][cols]
+    strategy = [0.0] * rows
+    for j, (kind, i) in enumerate(top_labels):
+        if kind == "x":
+            strategy[i] = tableau[rows][j] / corner
+    return 1 / corner - shift, strategy
+
+class GopsSolver:
+    """Exact solver for gops subgames by backward induction over simultaneous bids.
+
+    Positions are described from "my" point of view with bitmasks (bit `v - 1` for card `v`):
+    both players' remaining hands, the cards still in the deck, the value of all active bid targets
+    (`pot`, including the current target) and `diff`, my score minus my opponent's score.
+    Values are the expected game result for me: 1 for a win, -1 for a loss and 0 for a draw,
+    assuming both players play the Nash equilibrium from here on.
+
+    Values are memoized in `self.transpositions`, keyed on canonical states, so one solver
+    should be reused for every decision in a tournament.
+    An optional `EndgameTable` is consulted before solving positions it covers.
+    """
+    def __init__(self, table=None):
+        self.transpositions = {}
+        self.table = table
+
+    def solve(self, my_hand, opponent_hand, deck, pot, diff):
+        """Solves the position where both players are about to bid on `pot`.
+        Returns (value, strategy) where strategy maps my card values to probabilities.
+        """
+        my_values = values_of_mask(my_hand)
+        payoffs = self.payoff_matrix(my_hand, opponent_hand, deck, pot, diff)
+        value, probabilities = solve_matrix_game(payoffs)
+        strategy = {}
+        for card_value, probability in zip(my_values, probabilities):
+            # the pivot method can leave tiny negative round-off
+            strategy[card_value] = max(0.0, probability)
+        return value, strategy
+
+    def payoff_matrix(self, my_hand, opponent_hand, deck, pot, diff):
+        payoffs = []
+        for my_value in values_of_mask(my_hand):
+            my_rest = my_hand & ~(1 << (my_value - 1))
+            row = []
+            for opponent_value in values_of_mask(opponent_hand):
+                opponent_rest = opponent_hand & ~(1 << (opponent_value - 1))
+                if my_value > opponent_value:
+                    row.append(self.draw_value(my_rest, opponent_rest, deck, 0, diff + pot))
+                elif my_value < opponent_value:
+                    row.append(self.draw_value(my_rest, opponent_rest, deck, 0, diff - pot))
+                else:
+                    # tie; the pot is pushed to the next target
+                    row.append(self.draw_value(my_rest, opponent_rest, deck, pot, diff))
+            payoffs.append(row)
+        return payoffs
+
+    def bid_value(self, my_hand, opponent_hand, deck, pot, diff):
+        """Value of the position where both players are about to bid on `pot`."""
+        remaining = pot + sum(values_of_mask(deck))
+        if diff > remaining or diff < -remaining:
+            return sign(diff)
+        key, flipped = transposition_key("bid", my_hand, opponent_hand, deck, pot, diff)
+        if key in self.transpositions:
+            value = self.transpositions[key]
+            return -value if flipped else value
+        if my_hand & (my_hand - 1) == 0:
+            # one card each; no choice left
+            value = self.payoff_matrix(my_hand, opponent_hand, deck, pot, diff)[0][0]
+        else:
+            value = solve_matrix_game(self.payoff_matrix(my_hand, opponent_hand, deck, pot, diff))[0]
+        self.transpositions[key] = -value if flipped else value
+        return value
+
+    def draw_value(self, my_hand, opponent_hand, deck, pot, diff):
+        """Value of the position before the next target is drawn from `deck`."""
+        if my_hand == 0:
+            return sign(diff)
+        deck_values = values_of_mask(deck)
+        remaining = pot + sum(deck_values)
+        if diff > remaining or diff < -remaining:
+            return sign(diff)
+        if self.table is not None:
+            value = self.table.lookup(my_hand, opponent_hand, deck, pot, diff)
+            if value is not None:
+                return value
+        key, flipped = transposition_key("draw", my_hand, opponent_hand, deck, pot, diff)
+        if key in self.transpositions:
+            value = self.transpositions[key]
+            return -value if flipped else value
+        total = 0
+        for target in deck_values:
+            total += self.bid_value(my_hand, opponent_hand, deck & ~(1 << (target - 1)), pot + target, diff)
+        value = total / len(deck_values)
+        self.transpositions[key] = -value if flipped else value
+        return value
+
+    def clear(self):
+        self.transpositions = {}
\ No newline at end of file
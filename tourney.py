@@ -25,8 +25,14 @@ def load_bots(bot_dir, game_type):
         classes = inspect.getmembers(module, inspect.isclass)
 
         for name, obj in classes:
-            if issubclass(obj, PgopsBot) and obj is not PgopsBot:
-                bots.append(obj(game_type))
+            # skip classes imported into the module, such as base classes
+            if issubclass(obj, PgopsBot) and obj.__module__ == module.__name__:
+                try:
+                    bots.append(obj(game_type))
+                except Exception as e:
+                    # e.g. a bot that does not support this game type
+                    print(f'Could not load bot {name} from file {bot_file}: {e}')
+                    continue
                 print(f'loaded bot from file {bot_file}')
 
     return bots
@@ -45,7 +51,42 @@ def get_args():
     parser.add_argument('-t', '--tournaments', type=int, default=3,
                         help='Number of tournaments to run')
     parser.add_argument('-f', '--format', default='round_robin',
+                        choices=['round_robin', 'random_matches', 'swiss', 'single_elimination', 'double_elimination', 'ladder'],
                         help='Tournament format')
+    parser.add_argument('--swiss-rounds', type=int, default=None,
+                        help='Rounds per swiss tournament (default: log2 of the number of bots, rounded up)')
+    parser.add_argument('--ladder', default=None,
+                        help='SQLite file of the persistent ladder used by --format ladder')
+    parser.add_argument('--match-format', default='standard',
+                        choices=['standard', 'duplicate'],
+                        help='"duplicate" plays every deal twice with seats swapped')
+    parser.add_argument('--stopping-rule', default=None,
+                        choices=['sprt', 'confidence_interval'],
+                        help='End matches early once the winner is statistically decided')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='Number of worker processes used to play matches')
+    parser.add_argument('--move-time-limit', type=float, default=None,
+                        help='Seconds a bot may spend choosing one card')
+    parser.add_argument('--game-time-limit', type=float, default=None,
+                        help='Seconds a bot may spend in its callbacks over one game')
+    parser.add_argument('--clock-policy', default='warn',
+                        choices=['warn', 'forfeit_move', 'forfeit_game'],
+                        help='What happens to a bot that exceeds a time limit')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print call counts and time percentiles per bot method and engine phase')
+    parser.add_argument('--profile-out', default=None,
+                        help='Also write the profile to this CSV file; implies --profile')
+    parser.add_argument('--game-log', default=None,
+                        help='Append every turn to this binary game log (one shard per worker process)')
+    parser.add_argument('--rating-method', default=None,
+                        choices=['elo', 'bradley_terry'],
+                        help='"bradley_terry" fits order-independent ratings with intervals at the end of the run')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='Tournament seed; the same seed reproduces the whole tournament')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='Skip the Elo table and heatmap; plotting libraries are not imported')
+    parser.add_argument('--heatmap', default=None,
+                        help='Write the Elo heatmap to this file instead of showing it')
     return parser.parse_args()
 
 if __name__ == "__main__":
@@ -58,4 +99,19 @@ if __name__ == "__main__":
                                 tournament_format=args.format,
                                 matches_per_pairing=args.matches,
                                 games_per_match=args.games,
-                                num_tournaments=args.tournaments)
+                                num_tournaments=args.tournaments,
+                                workers=args.workers,
+                                visualize=not args.no_plot,
+                                heatmap_path=args.heatmap,
+                                seed=args.seed,
+                                match_format=args.match_format,
+                                stopping_rule=args.stopping_rule,
+                                move_time_limit=args.move_time_limit,
+                                game_time_limit=args.game_time_limit,
+                                clock_policy=args.clock_policy,
+                                profile=args.profile,
+                                profile_path=args.profile_out,
+                                game_log_path=args.game_log,
+                                rating_method=args.rating_method,
+                                swiss_rounds=args.swiss_rounds,
+                                ladder_path=args.ladder)